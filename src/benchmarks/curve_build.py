@@ -0,0 +1,165 @@
+import argparse
+import datetime as dtm
+import json
+import logging
+import pickle
+import platform
+import subprocess
+import time
+import tracemalloc
+from functools import partial
+from typing import Callable
+
+from data_api import cfets, cme_client, db_reader
+from instruments.swaps import schedule
+from markets import usd_lib, usd_rates, cny_rates
+from models.rate_curve_builder import RateCurveGroupModel
+from models.rate_curve_types import RateCurveBuildMethod
+
+logger = logging.Logger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+SNAPSHOT_FILE = 'data/curve_build_snapshot.pkl'
+# market data sources used to construct the curves
+SNAPSHOT_FUNCTIONS = [
+    (db_reader, 'read_fixings'),
+    (db_reader, 'read_IMM_futures'),
+    (db_reader, 'read_serial_futures'),
+    (db_reader, 'read_future_codes'),
+    (db_reader, 'read_meeting_dates'),
+    (db_reader, 'read_swap_conventions'),
+    (cme_client, 'get_future_settle_prices'),
+    (cme_client, 'get_swap_data'),
+    (cfets, 'load_fx'),
+    (cfets, 'load_swaps'),
+    (cfets, 'load_fixings'),
+    (usd_lib, 'get_last_trade_date'),
+]
+# arguments relative to today are not part of the snapshot key
+SNAPSHOT_IGNORED_ARGS = {'read_fixings': ('from_date',)}
+
+
+def _get_key(name: str, args: tuple, kwargs: dict) -> tuple:
+    ignored = SNAPSHOT_IGNORED_ARGS.get(name, ())
+    return (name, args, tuple(sorted((k, v) for k, v in kwargs.items() if k not in ignored)))
+
+def _record(snapshot: dict, name: str, func: Callable):
+    def wrapped(*args, **kwargs):
+        key = _get_key(name, args, kwargs)
+        if key not in snapshot:
+            snapshot[key] = func(*args, **kwargs)
+        return snapshot[key]
+    return wrapped
+
+def _replay(snapshot: dict, name: str):
+    def wrapped(*args, **kwargs):
+        key = _get_key(name, args, kwargs)
+        if key not in snapshot:
+            raise KeyError(f"{key} not in snapshot {SNAPSHOT_FILE}, record it again")
+        return snapshot[key]
+    return wrapped
+
+def patch_data_sources(record: bool) -> dict:
+    if record:
+        snapshot = {}
+    else:
+        with open(SNAPSHOT_FILE, 'rb') as f:
+            snapshot = pickle.load(f)
+    for module, name in SNAPSHOT_FUNCTIONS:
+        func = getattr(module, name)
+        setattr(module, name, _record(snapshot, name, func) if record else _replay(snapshot, name))
+    return snapshot
+
+
+def construct_usd(date: dtm.date, build_method: RateCurveBuildMethod = usd_rates.BUILD_METHOD) -> list[RateCurveGroupModel]:
+    return usd_rates.construct(date, build_method=build_method)
+
+def construct_cny(date: dtm.date) -> list[RateCurveGroupModel]:
+    # CNY cross currency curve is collateralized on USD SOFR
+    for ycg in usd_rates.construct(date):
+        ycg.build()
+    return cny_rates.construct()
+
+BENCHMARK_CASES = {
+    'USD': (construct_usd, {}),
+    'USD_Convexity': (construct_usd, {'calibrate_convexity': True}),
+    'USD_LeastSquares': (partial(construct_usd, build_method=RateCurveBuildMethod.LeastSquares), {}),
+    'CNY': (construct_cny, {}),
+}
+
+
+def run_case(date: dtm.date, construct_func: Callable, build_kwargs: dict, repeat: int) -> dict[str, float]:
+    build_times = []
+    for _ in range(repeat):
+        curve_groups = construct_func(date)
+        start_time = time.perf_counter()
+        for ycg in curve_groups:
+            ycg.build(**build_kwargs)
+        build_times.append(time.perf_counter() - start_time)
+    # counters and memory tracing slow the build so are measured on separate runs
+    curve_groups = construct_func(date)
+    pv_calls = 0
+    for ycg in curve_groups:
+        ycg.enable_stats()
+        ycg.build(**build_kwargs)
+        pv_calls += int(ycg.get_build_summary()['PV Calls'].sum())
+    curve_groups = construct_func(date)
+    tracemalloc.start()
+    for ycg in curve_groups:
+        ycg.build(**build_kwargs)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'ops_per_sec': len(build_times) / sum(build_times),
+        'mean_time': sum(build_times) / len(build_times),
+        'min_time': min(build_times),
+        'pv_calls': pv_calls,
+        'peak_memory': peak_memory,
+    }
+
+def get_git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(cases: list[str], repeat: int) -> dict:
+    date = usd_lib.get_last_trade_date()
+    results = {}
+    for case in cases:
+        construct_func, build_kwargs = BENCHMARK_CASES[case]
+        results[case] = run_case(date, construct_func, build_kwargs, repeat)
+        logger.info(f"{case}: {results[case]}")
+    return {
+        'commit': get_git_commit(),
+        'timestamp': dtm.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'date': date.isoformat(),
+        'repeat': repeat,
+        'results': results,
+        'schedule_cache': {name: info._asdict() for name, info in schedule.get_cache_info().items()},
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Curve build benchmarks on a local market data snapshot')
+    parser.add_argument('--record', action='store_true', help='Load data from sources and save snapshot')
+    parser.add_argument('--cases', default=','.join(BENCHMARK_CASES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default='')
+    args = parser.parse_args()
+    snapshot = patch_data_sources(args.record)
+    if args.record:
+        # one pass of every case loads the data to be saved
+        run([case.strip() for case in args.cases.split(',')], repeat=1)
+        with open(SNAPSHOT_FILE, 'wb') as f:
+            pickle.dump(snapshot, f)
+        logger.warning(f"Saved {len(snapshot)} data requests to {SNAPSHOT_FILE}")
+    else:
+        output = run([case.strip() for case in args.cases.split(',')], repeat=args.repeat)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(output, f, indent=2)
+        else:
+            print(json.dumps(output, indent=2))
@@ -0,0 +1,118 @@
+import argparse
+import datetime as dtm
+import itertools
+import json
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable
+
+from common.chrono.calendar import CalendarID
+from common.date_helper import get_bdate_series
+from lib.interpolator import Interpolator, get_values
+
+DF_INTERPOLATORS = ['LogLinear', 'LogCubic', 'Default', 'MonotoneConvex', 'FlatRate', 'FlatRateBD', 'LogAkima']
+VOL_INTERPOLATORS = ['RootMeanSquare']
+START_DATE = dtm.date(2025, 1, 2)
+DCF_UNIT = 1 / 360
+
+
+def usd_forward_rate(x: float) -> float:
+    # cutting cycle with a term premium at the long end
+    return 0.043 - 0.01 * (1 - np.exp(-x / 1.5)) + 0.006 * (1 - np.exp(-x / 10))
+
+def cny_forward_rate(x: float) -> float:
+    return 0.016 + 0.004 * (1 - np.exp(-x / 4))
+
+def usd_vol(x: float) -> float:
+    return 0.014 - 0.004 * (1 - np.exp(-x / 2))
+
+# node dates like the curve builds, meeting steps and futures at the front and swaps after
+NODE_SETS = {
+    'USD': (CalendarID.USEX, usd_forward_rate,
+            [42, 91, 133, 182, 224, 273, 315] + [91 * q for q in range(4, 11)] +
+            [365 * y for y in (3, 4, 5, 6, 7, 8, 9, 10, 12, 15, 20, 25, 30, 40, 50)]),
+    'CNY': (CalendarID.CNY, cny_forward_rate,
+            [7, 30, 91, 182, 273] + [365 * y for y in (1, 2, 3, 4, 5, 7, 10)]),
+}
+
+
+def get_reference(forward_rate: Callable[[float], float], xs: np.ndarray) -> np.ndarray:
+    """Discount factors integrating the forward rate on a daily grid"""
+    grid = np.arange(0, xs.max() + DCF_UNIT, DCF_UNIT)
+    log_dfs = np.concatenate(([0], -np.cumsum(forward_rate(grid[:-1]) * DCF_UNIT)))
+    return np.exp(np.interp(xs, grid, log_dfs))
+
+def get_vol_reference(xs: np.ndarray) -> np.ndarray:
+    """Root mean square of the vol on a daily grid"""
+    grid = np.arange(0, xs.max() + DCF_UNIT, DCF_UNIT)
+    variances = np.concatenate(([0], np.cumsum(usd_vol(grid[:-1]) ** 2 * DCF_UNIT)))
+    return np.sqrt(np.interp(xs, grid, variances) / xs)
+
+def get_interpolator_args(name: str, calendar: CalendarID, last_date: dtm.date) -> list:
+    if name == 'FlatRate':
+        return [DCF_UNIT]
+    elif name == 'FlatRateBD':
+        # business days past the last node so it has one on or after it
+        bdates = get_bdate_series(START_DATE, last_date + dtm.timedelta(days=7), calendar)
+        return [[(dt - START_DATE).days * DCF_UNIT for dt in bdates]]
+    return []
+
+def time_call(func: Callable, repeat: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start_time) / repeat
+
+def run_interpolator(name: str, knots: list[tuple[float, float]], args: list, xs: np.ndarray,
+                     reference: np.ndarray, repeat: int) -> dict[str, float]:
+    interp_cls = Interpolator.fromString(name)
+    interpolator = interp_cls(knots, *args)
+    knots_bumped = knots.copy()
+    bump_id = len(knots) // 2
+    knots_bumped[bump_id] = (knots[bump_id][0], knots[bump_id][1] * np.exp(-1e-4))
+    values = get_values(interpolator, xs)
+    # alternate knots so incremental updates always see a change
+    knots_cycle = itertools.cycle([knots_bumped, knots])
+    scalar_time = time_call(lambda: [interpolator.get_value(x) for x in xs], max(repeat // 10, 1)) / len(xs)
+    return {
+        'construct': time_call(lambda: interp_cls(knots, *args), repeat),
+        'update': time_call(lambda: interpolator.update(next(knots_cycle)), repeat),
+        'scalar_eval': scalar_time,
+        'batch_eval': time_call(lambda: get_values(interpolator, xs), repeat) / len(xs),
+        'max_deviation': float(np.abs(values / reference - 1).max()),
+    }
+
+def run(repeat: int) -> pd.DataFrame:
+    results = []
+    for ccy, (calendar, forward_rate, node_days) in NODE_SETS.items():
+        node_xs = np.array([0] + node_days) * DCF_UNIT
+        last_date = START_DATE + dtm.timedelta(days=node_days[-1])
+        bdates = get_bdate_series(START_DATE, last_date, calendar)
+        xs = np.array([(dt - START_DATE).days for dt in bdates[1:]]) * DCF_UNIT
+        reference = get_reference(forward_rate, xs)
+        df_knots = list(zip(node_xs, get_reference(forward_rate, node_xs)))
+        for name in DF_INTERPOLATORS:
+            args = get_interpolator_args(name, calendar, last_date)
+            results.append({'set': ccy, 'interpolator': name,
+                            **run_interpolator(name, df_knots, args, xs, reference, repeat)})
+        # vol nodes apply till the next node
+        vol_knots = list(zip(node_xs, usd_vol(node_xs)))
+        vol_reference = get_vol_reference(xs)
+        for name in VOL_INTERPOLATORS:
+            results.append({'set': ccy, 'interpolator': name,
+                            **run_interpolator(name, vol_knots, [], xs, vol_reference, repeat)})
+    return pd.DataFrame(results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Interpolator timings and deviation from reference curves')
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--output', default='')
+    args = parser.parse_args()
+    results = run(args.repeat)
+    pd.set_option('display.width', 200)
+    print(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results.to_dict(orient='records'), f, indent=2)
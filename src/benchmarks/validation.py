@@ -0,0 +1,71 @@
+import argparse
+import logging
+import numpy as np
+
+from benchmarks.curve_build import BENCHMARK_CASES, patch_data_sources
+from markets import usd_lib
+from models.rate_curve_builder import RateCurveGroupModel, CURVE_SOLVER_TOLERANCE
+from models.rate_curve_types import RateCurveBuildMethod
+
+logger = logging.Logger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.StreamHandler())
+
+# forward difference bumps of EPSILON in log node values
+JACOBIAN_RTOL = 1e-3
+JACOBIAN_ATOL = 1e-10
+
+
+def check_jacobian(ycg: RateCurveGroupModel) -> float:
+    """Analytic Jacobian against node bumps, relative to the largest entry of each instrument row"""
+    analytic = ycg.get_jacobian_matrix()
+    bumped = ycg.get_jacobian_matrix_bump().toarray()
+    scale = np.abs(bumped).max(axis=1, keepdims=True) + JACOBIAN_ATOL
+    error = (np.abs(analytic - bumped) / scale).max()
+    assert error <= JACOBIAN_RTOL, f"{ycg.name} analytic Jacobian differs from node bumps by {error:.2e}"
+    return error
+
+def check_jacobian_sparsity(ycg: RateCurveGroupModel) -> float:
+    """Largest analytic Jacobian entry outside the sparsity pattern"""
+    analytic = ycg.get_jacobian_matrix()
+    outside = np.abs(analytic[ycg.get_jacobian_sparsity().toarray() == 0])
+    error = outside.max() if outside.size else 0.0
+    assert error == 0, f"{ycg.name} analytic Jacobian has {np.count_nonzero(outside)} entries outside the sparsity pattern"
+    return error
+
+def check_bootstrap(ycg: RateCurveGroupModel) -> float:
+    """Residuals of the dirty node bootstrap against a rebuild solving every node on each pass"""
+    if ycg._build_method != RateCurveBuildMethod.Bootstrap:
+        return 0.0
+    residuals = ycg.get_node_pvs()
+    for crv_model in ycg.models:
+        crv_model.reset(ycg.date)
+    assert ycg.build_bootstrap(full_sweep=True), f"{ycg.name} full sweep bootstrap failed"
+    error = np.abs(residuals - ycg.get_node_pvs()).max()
+    assert error <= CURVE_SOLVER_TOLERANCE, f"{ycg.name} bootstrap residuals differ from full sweep by {error:.2e}"
+    return error
+
+GROUP_CHECKS = {
+    'jacobian': check_jacobian,
+    'sparsity': check_jacobian_sparsity,
+    'bootstrap': check_bootstrap,
+}
+
+
+def run(cases: list[str], checks: list[str]) -> None:
+    date = usd_lib.get_last_trade_date()
+    for case in cases:
+        construct_func, build_kwargs = BENCHMARK_CASES[case]
+        for ycg in construct_func(date):
+            ycg.build(**build_kwargs)
+            for check in checks:
+                logger.info(f"{case} {ycg.name} {check}: {GROUP_CHECKS[check](ycg):.2e}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Curve build consistency checks on the local market data snapshot')
+    parser.add_argument('--cases', default=','.join(BENCHMARK_CASES))
+    parser.add_argument('--checks', default=','.join(GROUP_CHECKS))
+    args = parser.parse_args()
+    patch_data_sources(record=False)
+    run([case.strip() for case in args.cases.split(',')], [check.strip() for check in args.checks.split(',')])
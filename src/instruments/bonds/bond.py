@@ -9,6 +9,7 @@ from common.models.data_series import DataSeries
 from common.chrono.frequency import Tenor, Frequency, Compounding
 from common.chrono.daycount import DayCount
 from instruments.rate_curve import RateCurve
+from lib import daycount_helper as dcf_lib
 
 
 FACE_VALUE = 100
@@ -32,7 +33,7 @@ class BondYieldParameters:
         return Frequency(self._compounding.value).get_unit_dcf()
     
     def get_dcf(self, from_date: dtm.date, to_date: dtm.date) -> float:
-        return self._daycount_type.get_dcf(from_date, to_date)
+        return dcf_lib.get_dcf(self._daycount_type, from_date, to_date)
 
 @dataclass
 class BondSettleInfo:
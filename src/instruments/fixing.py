@@ -1,8 +1,13 @@
 from pydantic.dataclasses import dataclass
 from enum import StrEnum
 import datetime as dtm
+import bisect
 
 from common.models.base_instrument import BaseInstrument
+from common.date_helper import get_bdate_series
+from common.chrono.calendar import CalendarID
+from common.chrono.daycount import DayCount
+from lib import daycount_helper as dcf_lib
 
 
 class RateFixingType(StrEnum):
@@ -22,6 +27,82 @@ class RateFixing(BaseInstrument):
     def get_last_value(self) -> float:
         return self.data.get_last_point()[1]
 
+@dataclass
+class RateFixingIndex:
+    """Cumulative compounded and simple fixing amounts on business dates up to the day after the last fixing,
+    like a published overnight index so seasoned accruals are ratios or differences of two points"""
+    _fixing: RateFixing
+    _calendar: CalendarID
+    _daycount_type: DayCount = DayCount.ACT360
+
+    def __post_init__(self):
+        self._ordinals = []
+        self._rates = []
+        # product of (1 + fixing x day count fraction) and sum of fixing x days before each date
+        self._compounded = []
+        self._sums = []
+        self.extend()
+    
+    def extend(self) -> None:
+        """Adds business dates up to the one after the last fixing, only new dates are computed"""
+        last_ordinal = self._fixing.data.get_last_point()[0].toordinal()
+        if self._ordinals and self._ordinals[-1] > last_ordinal:
+            return
+        if self._ordinals:
+            from_date = dtm.date.fromordinal(self._ordinals[-1])
+            # rate on the last date was filled before its fixing was published
+            self._rates[-1] = self._fixing.get(from_date)
+        else:
+            from_date = self._fixing.data.peekitem(0)[0]
+        # long enough to reach past any holiday break
+        to_date = dtm.date.fromordinal(last_ordinal + 15)
+        for bd in get_bdate_series(from_date, to_date, self._calendar):
+            ordinal = bd.toordinal()
+            if not self._ordinals:
+                self._compounded.append(1)
+                self._sums.append(0)
+            elif ordinal > self._ordinals[-1]:
+                prev_date = dtm.date.fromordinal(self._ordinals[-1])
+                dcf = dcf_lib.get_dcf(self._daycount_type, prev_date, bd)
+                self._compounded.append(self._compounded[-1] * (1 + self._rates[-1] * dcf))
+                self._sums.append(self._sums[-1] + self._rates[-1] * (ordinal - self._ordinals[-1]))
+            else:
+                continue
+            self._ordinals.append(ordinal)
+            self._rates.append(self._fixing.get(bd))
+            if ordinal > last_ordinal:
+                break
+    
+    def _get_position(self, date: dtm.date) -> int | None:
+        ordinal = date.toordinal()
+        if self._ordinals and ordinal > self._ordinals[-1]:
+            self.extend()
+        if not self._ordinals or ordinal < self._ordinals[0] or ordinal > self._ordinals[-1]:
+            return None
+        return bisect.bisect_right(self._ordinals, ordinal) - 1
+    
+    def get_compounded_amount(self, from_date: dtm.date, to_date: dtm.date) -> float | None:
+        """Compounded fixings between business dates, None if either is not covered"""
+        from_id, to_id = self._get_position(from_date), self._get_position(to_date)
+        if from_id is None or to_id is None or \
+            self._ordinals[from_id] != from_date.toordinal() or self._ordinals[to_id] != to_date.toordinal():
+            return None
+        return self._compounded[to_id] / self._compounded[from_id]
+    
+    def _get_sum(self, date: dtm.date) -> float | None:
+        pos = self._get_position(date)
+        if pos is None:
+            return None
+        # fixing applies till the next business date
+        return self._sums[pos] + self._rates[pos] * (date.toordinal() - self._ordinals[pos])
+    
+    def get_simple_sum(self, from_date: dtm.date, to_date: dtm.date) -> float | None:
+        """Sum of fixings weighted by calendar days between dates, None if either is not covered"""
+        from_sum, to_sum = self._get_sum(from_date), self._get_sum(to_date)
+        if from_sum is None or to_sum is None:
+            return None
+        return to_sum - from_sum
+
 
 @dataclass
 class InflationIndex(BaseInstrument):
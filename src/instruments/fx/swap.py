@@ -1,5 +1,6 @@
 from pydantic.dataclasses import dataclass
 import datetime as dtm
+import numpy as np
 
 from instruments.rate_curve import RateCurve
 from .base import FXBase
@@ -43,6 +44,28 @@ class FXSwap(FXBase):
         else:
             fwd_pts = (ccy1_far_df / ccy2_far_df - ccy1_near_df / ccy2_near_df) * spot_price
         return (fwd_pts - self.data[value_date] * self._units)
+    
+    def get_pv_sensitivities(self, discount_curve: RateCurve, ref_discount_curve: RateCurve,
+                             spot: FXSpot) -> list[tuple[RateCurve, dtm.date, float]]:
+        sensitivities = []
+        spot_date = spot._settle_date
+        spot_price = spot.data[discount_curve.date]
+        # forward points are ratios of discount factors, sign of log sensitivity flips with quote direction
+        sign = 1 if self._inverse else -1
+        for settle_date, mult in [(self._far_settle_date, 1), (self._near_settle_date, -1)]:
+            if not settle_date or settle_date == spot_date:
+                continue
+            ccy1_df = discount_curve.get_df(settle_date) / discount_curve.get_df(spot_date)
+            ccy2_df = ref_discount_curve.get_df(settle_date) / ref_discount_curve.get_df(spot_date)
+            fwd_ratio = ccy2_df / ccy1_df if self._inverse else ccy1_df / ccy2_df
+            value = sign * mult * fwd_ratio * spot_price
+            sensitivities.extend([
+                (ref_discount_curve, settle_date, value),
+                (ref_discount_curve, spot_date, -value),
+                (discount_curve, settle_date, -value),
+                (discount_curve, spot_date, value),
+            ])
+        return sensitivities
 
 
 @dataclass
@@ -62,3 +85,12 @@ class FXCurve(RateCurve):
             else:
                 spot_pv = spot_price * self._domestic_curve.get_df(spot_date) / self.get_df(spot_date)
                 return spot_pv * self.get_df(date) / self._domestic_curve.get_df(date)
+    
+    def get_forward_prices(self, dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        spot_price = self._spot.data[self.date]
+        spot_df_ratio = self.get_df(self._spot.settle_date) / self._domestic_curve.get_df(self._spot.settle_date)
+        df_ratios = self.get_dfs(dates) / self._domestic_curve.get_dfs(dates)
+        if self._spot.inverse:
+            return spot_price * spot_df_ratio / df_ratios
+        else:
+            return spot_price * df_ratios / spot_df_ratio
@@ -1,6 +1,8 @@
 from pydantic.dataclasses import dataclass
 from dataclasses import InitVar, field
+from collections.abc import Sequence
 import datetime as dtm
+import bisect
 import numpy as np
 
 from common.date_helper import get_bdate_series
@@ -9,7 +11,9 @@ from common.chrono.calendar import CalendarID
 from common.chrono.daycount import DayCount
 from common.base_class import NameDateClass
 
-from lib.interpolator import Interpolator
+from lib import daycount_helper as dcf_lib
+from lib.daycount_helper import ACT_DAYCOUNTS, get_ordinals
+from lib.interpolator import Interpolator, LOG_LINEAR_TYPES, get_log_weights, get_support_width, get_values
 from instruments.base_types import DataPoint
 
 
@@ -18,6 +22,88 @@ from instruments.base_types import DataPoint
 class RateCurveNode(DataPoint):
     pass
 
+class RateCurveNodes(Sequence):
+    """Read-only view of curve nodes over its node arrays"""
+
+    def __init__(self, curve: 'RateCurve'):
+        self._curve = curve
+    
+    def __len__(self) -> int:
+        return len(self._curve._node_ordinals)
+    
+    def __getitem__(self, i: int | slice) -> RateCurveNode | list[RateCurveNode]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return RateCurveNode(dtm.date.fromordinal(int(self._curve._node_ordinals[i])),
+                             float(self._curve._node_values[i]))
+
+class FrozenRateCurve:
+    """Immutable evaluator of a built curve from log discount factors on a grid of dates.
+    Log-linear segments keep their nodes, other segments are tabulated daily so values match on dates.
+    Beyond the grid it defers to the curve it was frozen from, which a rebuild replaces rather than re-solves."""
+    __slots__ = ('name', 'date', '_daycount_type', '_calendar', '_ordinals', '_log_dfs', '_tail_curve',
+                 '_ordinals_list', '_log_dfs_list')
+
+    def __init__(self, curve: 'RateCurve', ordinals: np.ndarray):
+        for attr, value in [
+            ('name', curve.name), ('date', curve.date),
+            ('_daycount_type', curve._daycount_type), ('_calendar', curve._calendar),
+            ('_ordinals', ordinals), ('_log_dfs', np.log(curve.get_dfs(ordinals))),
+            ('_tail_curve', curve),
+        ]:
+            object.__setattr__(self, attr, value)
+        object.__setattr__(self, '_ordinals_list', ordinals.tolist())
+        object.__setattr__(self, '_log_dfs_list', self._log_dfs.tolist())
+    
+    def __setattr__(self, *_):
+        raise AttributeError(f"Frozen curve {self.name} cannot be modified")
+    
+    # pickle and copy restore slots through setattr by default
+    def __getstate__(self) -> dict:
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+    
+    def __setstate__(self, state: dict) -> None:
+        for attr, value in state.items():
+            object.__setattr__(self, attr, value)
+    
+    def display_name(self) -> str:
+        return f"{self.name}:{self.date.strftime('%d-%b')}"
+    
+    def get_dcf_from(self, from_date: dtm.date, to_date: dtm.date) -> float:
+        return dcf_lib.get_dcf(self._daycount_type, from_date, to_date)
+
+    def get_dcf(self, to_date: dtm.date) -> float:
+        return self.get_dcf_from(self.date, to_date)
+    
+    def get_df(self, date: dtm.date) -> float:
+        assert date >= self.date, f"Cannot discount before valuation date {self.date}"
+        ordinal = date.toordinal()
+        ordinals, log_dfs = self._ordinals_list, self._log_dfs_list
+        ih = bisect.bisect_left(ordinals, ordinal)
+        if ih == len(ordinals):
+            return self._tail_curve.get_df(date)
+        if ordinals[ih] == ordinal:
+            return np.exp(log_dfs[ih])
+        weight = (ordinal - ordinals[ih-1]) / (ordinals[ih] - ordinals[ih-1])
+        return np.exp(log_dfs[ih-1] + weight * (log_dfs[ih] - log_dfs[ih-1]))
+    
+    def get_dfs(self, dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        ordinals = get_ordinals(dates)
+        log_dfs = np.interp(ordinals, self._ordinals, self._log_dfs)
+        dfs = np.exp(log_dfs)
+        beyond = ordinals > self._ordinals[-1]
+        if beyond.any():
+            dfs[beyond] = self._tail_curve.get_dfs(ordinals[beyond])
+        return dfs
+    
+    def get_forward_rate(self, from_date: dtm.date, to_date: dtm.date) -> float:
+        return (self.get_df(from_date) / self.get_df(to_date) - 1) / self.get_dcf_from(from_date, to_date)
+    
+    def get_spot_rate(self, date: dtm.date, compounding: Compounding = Compounding.Daily) -> float:
+        assert date > self.date, f"{date} should be after valuation date {self.date}"
+        dcf = self.get_dcf(date)
+        return compounding.get_rate(self.get_df(date), dcf, dcf_unit=self._daycount_type.get_unit_dcf())
+
 # __init__ cannot be overridden so we declare InitVar and assign __post_init__
 # https://docs.python.org/3/library/dataclasses.html#init-only-variables
 @dataclass
@@ -28,7 +114,6 @@ class RateCurve(NameDateClass):
     _daycount_type: DayCount = field(kw_only=True, default=DayCount.ACT360)
     _calendar: CalendarID = field(kw_only=True, default=None)
 
-    _nodes: list[RateCurveNode] = field(init=False)
     _interpolators: list[tuple[dtm.date, Interpolator]] = field(init=False)
 
     def display_name(self) -> str:
@@ -37,7 +122,9 @@ class RateCurve(NameDateClass):
     def __post_init__(self, nodes_init, interpolation_methods: list[str]):
         assert len(nodes_init) > 0, "Cannot build rate curve without nodes"
         assert nodes_init[0][0] > self.date, f"First node {nodes_init[0][0]} should be after valuation date {self.date}"
-        self._nodes = [RateCurveNode(nd[0], nd[1]) for nd in nodes_init]
+        # parallel node arrays, nodes are a view over them
+        self._node_ordinals = np.array([nd[0].toordinal() for nd in nodes_init], dtype=int)
+        self._node_values = np.array([nd[1] for nd in nodes_init], dtype=float)
         self._interpolation_dates = [self.date]
         self._interpolator_classes = []
         if not interpolation_methods:
@@ -49,10 +136,24 @@ class RateCurve(NameDateClass):
                 args.append(self._daycount_type.get_unit_dcf())
             elif im == 'FlatRateBD':
                 bdates = get_bdate_series(self._interpolation_dates[-2], self._interpolation_dates[-1], self._calendar)
-                cached_dcfs = [self.get_dcf(d) for d in bdates]
-                args.append(cached_dcfs)
+                args.append(self.get_dcfs(bdates).tolist())
             interp_cls = Interpolator.fromString(im)
             self._interpolator_classes.append((interp_cls, *args))
+        # node index of each knot per interpolator, -1 for valuation date
+        node_dates = [self.date] + [nd[0] for nd in nodes_init]
+        self._interpolation_node_ids = []
+        for id in range(len(self._interpolator_classes)):
+            cto_d, cto_d_next = self._interpolation_dates[id], self._interpolation_dates[id+1]
+            self._interpolation_node_ids.append(
+                [ni-1 for ni, nd in enumerate(node_dates) if cto_d <= nd and nd <= cto_d_next])
+        self._node_index = {nd[0]: ni for ni, nd in enumerate(nodes_init)}
+        self._node_dcfs = self.get_dcfs(self._node_ordinals)
+        # interpolators whose knots include each node, two for a node on a cutoff date
+        self._node_interpolator_ids = [[] for _ in nodes_init]
+        for id, knot_ids in enumerate(self._interpolation_node_ids):
+            for ni in knot_ids:
+                if ni >= 0:
+                    self._node_interpolator_ids[ni].append(id)
         self._interpolators = [None] * len(self._interpolator_classes)
         self._set_interpolators()
 
@@ -60,43 +161,49 @@ class RateCurve(NameDateClass):
         if not cutoff:
             return dtm.date.max
         elif isinstance(cutoff, int):
-            assert cutoff >= 0 and cutoff < len(self._nodes)
-            return self._nodes[cutoff].date
+            assert cutoff >= 0 and cutoff < len(self._node_ordinals)
+            return dtm.date.fromordinal(int(self._node_ordinals[cutoff]))
         else:
             assert isinstance(cutoff, dtm.date), f"{cutoff} should be in date format"
             return cutoff
     
+    def _set_interpolator(self, id: int, reset: bool = True) -> None:
+        knots = [(float(self._node_dcfs[ni]), float(self._node_values[ni])) if ni >= 0 else (0, 1)
+                 for ni in self._interpolation_node_ids[id]]
+        if reset:
+            ic = self._interpolator_classes[id]
+            self._interpolators[id] = (self._interpolation_dates[id+1], ic[0](knots, *ic[1:]))
+        else:
+            self._interpolators[id][1].update(knots)
+    
     def _set_interpolators(self, reset: bool = True) -> None:
-        nodes = [RateCurveNode(self.date, 1)] + self._nodes
-        for id, ic in enumerate(self._interpolator_classes):
-            cto_d = self._interpolation_dates[id]
-            cto_d_next = self._interpolation_dates[id+1]
-            knots = [(self.get_dcf(nd.date), nd.value) for nd in nodes if cto_d <= nd.date and nd.date <= cto_d_next]
-            if reset:
-                self._interpolators[id] = (cto_d_next, ic[0](knots, *ic[1:]))
-            else:
-                self._interpolators[id][1].update(knots)
+        for id in range(len(self._interpolator_classes)):
+            self._set_interpolator(id, reset=reset)
+    
+    @property
+    def nodes(self) -> RateCurveNodes:
+        return RateCurveNodes(self)
     
     @property
-    def nodes(self):
-        return self._nodes
+    def node_values(self) -> np.ndarray:
+        return self._node_values.copy()
 
     def update_node(self, date: dtm.date, value: float) -> None:
-        for i, node in enumerate(self._nodes):
-            if node.date == date:
-                self._nodes[i] = RateCurveNode(date, value)
-                self._set_interpolators(reset=False)
-                return
-        raise KeyError(f"Invalid date {date} to set node")
+        if date not in self._node_index:
+            raise KeyError(f"Invalid date {date} to set node")
+        ni = self._node_index[date]
+        self._node_values[ni] = value
+        # only interpolators with the node as knot change
+        for id in self._node_interpolator_ids[ni]:
+            self._set_interpolator(id, reset=False)
 
     def update_nodes(self, log_values: list[float]) -> None:
-        assert len(self._nodes) == len(log_values), f"Inputs don't fit nodes {len(log_values)}"
-        for i, node in enumerate(self._nodes):
-            self._nodes[i] = RateCurveNode(node.date, np.exp(log_values[i]))
+        assert len(self._node_values) == len(log_values), f"Inputs don't fit nodes {len(log_values)}"
+        self._node_values[:] = np.exp(log_values)
         self._set_interpolators(reset=False)
     
     def get_dcf_from(self, from_date: dtm.date, to_date: dtm.date) -> float:
-        return self._daycount_type.get_dcf(from_date, to_date)
+        return dcf_lib.get_dcf(self._daycount_type, from_date, to_date)
 
     def get_dcf(self, to_date: dtm.date) -> float:
         return self.get_dcf_from(self.date, to_date)
@@ -111,6 +218,68 @@ class RateCurve(NameDateClass):
                 return interpolator.get_value(self.get_dcf(date))
         raise RuntimeError("Unreachable code")
 
+    def get_node_support(self) -> list[dtm.date]:
+        """Earliest date whose discount factor depends on each node"""
+        node_dates = [self.date] + [nd.date for nd in self.nodes]
+        support = [dtm.date.max] * len(self._node_ordinals)
+        for id, ic in enumerate(self._interpolator_classes):
+            knot_ids = self._interpolation_node_ids[id]
+            width = get_support_width(ic[0])
+            for ki, ni in enumerate(knot_ids):
+                if ni < 0:
+                    continue
+                if width and ki >= width:
+                    support_date = node_dates[knot_ids[ki-width]+1]
+                else:
+                    support_date = self._interpolation_dates[id]
+                support[ni] = min(support[ni], support_date)
+        return support
+    
+    def get_node_weights(self, dates: list[dtm.date]) -> np.ndarray:
+        """Sensitivities of log discount factors at dates to log node values"""
+        weights = np.zeros((len(dates), len(self._node_ordinals)))
+        interp_date_ids = {}
+        for di, date in enumerate(dates):
+            assert date >= self.date, f"Cannot discount before valuation date {self.date}"
+            if date == self.date:
+                continue
+            for id, (ctd, _) in enumerate(self._interpolators):
+                if not ctd or date < ctd:
+                    interp_date_ids.setdefault(id, []).append(di)
+                    break
+        for id, date_ids in interp_date_ids.items():
+            knot_weights = get_log_weights(self._interpolators[id][1], [self.get_dcf(dates[di]) for di in date_ids])
+            for ki, ni in enumerate(self._interpolation_node_ids[id]):
+                if ni >= 0:
+                    weights[date_ids, ni] += knot_weights[:, ki]
+        return weights
+
+    def get_freeze_ordinals(self) -> np.ndarray:
+        """Dates to evaluate a frozen curve on till the last node"""
+        date_ordinal = self.date.toordinal()
+        last_ordinal = int(self._node_ordinals[-1])
+        ordinals = [np.array([date_ordinal])]
+        from_ordinal = date_ordinal
+        for id, (ctd, interpolator) in enumerate(self._interpolators):
+            to_ordinal = min(ctd.toordinal(), last_ordinal)
+            if isinstance(interpolator, LOG_LINEAR_TYPES) and self._daycount_type in ACT_DAYCOUNTS:
+                node_ids = [ni for ni in self._interpolation_node_ids[id] if ni >= 0]
+                ordinals.append(self._node_ordinals[node_ids])
+            else:
+                ordinals.append(np.arange(from_ordinal, to_ordinal+1))
+            if to_ordinal >= last_ordinal:
+                break
+            from_ordinal = to_ordinal
+        return np.unique(np.concatenate(ordinals))
+    
+    def freeze(self) -> FrozenRateCurve:
+        """Fast immutable evaluator of the curve as built, re-calibration needs a new one"""
+        return FrozenRateCurve(self, self.get_freeze_ordinals())
+    
+    def get_interpolated_df(self, date: dtm.date) -> float:
+        """Discount factor from own nodes, excluding any base curve"""
+        return RateCurve.get_df(self, date)
+
     def get_forward_rate(self, from_date: dtm.date, to_date: dtm.date) -> float:
         from_df = self.get_df(from_date)
         to_df = self.get_df(to_date)
@@ -121,6 +290,44 @@ class RateCurve(NameDateClass):
         df = self.get_df(date)
         dcf = self.get_dcf(date)
         return compounding.get_rate(df, dcf, dcf_unit=self._daycount_type.get_unit_dcf())
+    
+    def get_dcfs_from(self, from_dates: list[dtm.date] | np.ndarray, to_dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        return dcf_lib.get_dcfs(self._daycount_type, from_dates, to_dates)
+    
+    def get_dcfs(self, dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        ordinals = get_ordinals(dates)
+        return self.get_dcfs_from(np.full(len(ordinals), self.date.toordinal()), ordinals)
+    
+    def get_dfs(self, dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        """Discount factors for an array of dates or ordinals"""
+        ordinals = get_ordinals(dates)
+        date_ordinal = self.date.toordinal()
+        assert len(ordinals) == 0 or ordinals.min() >= date_ordinal, f"Cannot discount before valuation date {self.date}"
+        dfs = np.ones(len(ordinals))
+        dcfs = self.get_dcfs(ordinals)
+        from_ordinal = date_ordinal
+        for ctd, interpolator in self._interpolators:
+            to_ordinal = ctd.toordinal() if ctd else dtm.date.max.toordinal()
+            mask = (ordinals > from_ordinal) & (ordinals < to_ordinal)
+            if from_ordinal > date_ordinal:
+                mask |= ordinals == from_ordinal
+            if mask.any():
+                dfs[mask] = get_values(interpolator, dcfs[mask])
+            from_ordinal = to_ordinal
+        assert len(ordinals) == 0 or ordinals.max() < from_ordinal, \
+            f"Cannot discount on or after last interpolation cutoff {dtm.date.fromordinal(from_ordinal)}"
+        return dfs
+    
+    def get_forward_rates(self, from_dates: list[dtm.date] | np.ndarray, to_dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        from_ordinals, to_ordinals = get_ordinals(from_dates), get_ordinals(to_dates)
+        return (self.get_dfs(from_ordinals) / self.get_dfs(to_ordinals) - 1) / self.get_dcfs_from(from_ordinals, to_ordinals)
+    
+    def get_spot_rates(self, dates: list[dtm.date] | np.ndarray, compounding: Compounding = Compounding.Daily) -> np.ndarray:
+        ordinals = get_ordinals(dates)
+        assert len(ordinals) == 0 or ordinals.min() > self.date.toordinal(), f"Dates should be after valuation date {self.date}"
+        dcf_unit = self._daycount_type.get_unit_dcf()
+        return np.array([compounding.get_rate(df, dcf, dcf_unit=dcf_unit)
+                         for df, dcf in zip(self.get_dfs(ordinals), self.get_dcfs(ordinals))])
 
 @dataclass
 class SpreadCurve(RateCurve):
@@ -131,6 +338,15 @@ class SpreadCurve(RateCurve):
     
     def get_df(self, date: dtm.date) -> float:
         return self._base_curve.get_df(date) * super().get_df(date)
+    
+    def get_dfs(self, dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        ordinals = get_ordinals(dates)
+        return self._base_curve.get_dfs(ordinals) * super().get_dfs(ordinals)
+    
+    def get_freeze_ordinals(self) -> np.ndarray:
+        ordinals = super().get_freeze_ordinals()
+        base_ordinals = self._base_curve.get_freeze_ordinals()
+        return np.union1d(ordinals, base_ordinals[base_ordinals <= ordinals[-1]])
 
     def get_spread_rate(self, date: dtm.date, compounding: Compounding = Compounding.Daily) -> float:
         df = self.get_spread_df(date)
@@ -147,6 +363,14 @@ class RollCurve:
     
     def get_df(self, _: dtm.date) -> float:
         """Gives discount factor from Rolled curve"""
+    
+    def get_dfs(self, _: list[dtm.date] | np.ndarray) -> np.ndarray:
+        """Gives discount factors from Rolled curve"""
+    
+    def get_forward_rates(self, from_dates: list[dtm.date] | np.ndarray, to_dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        from_ordinals, to_ordinals = get_ordinals(from_dates), get_ordinals(to_dates)
+        return (self.get_dfs(from_ordinals) / self.get_dfs(to_ordinals) - 1) / \
+            self._base_curve.get_dcfs_from(from_ordinals, to_ordinals)
 
 @dataclass
 class RollForwardCurve(RollCurve):
@@ -158,6 +382,9 @@ class RollForwardCurve(RollCurve):
     
     def get_df(self, date: dtm.date) -> float:
         return self._base_curve.get_df(date) / self._roll_df
+    
+    def get_dfs(self, dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        return self._base_curve.get_dfs(dates) / self._roll_df
 
 @dataclass
 class RollSpotCurve(RollCurve):
@@ -169,3 +396,6 @@ class RollSpotCurve(RollCurve):
     
     def get_df(self, date: dtm.date) -> float:
         return self._base_curve.get_df(date - self._date_delta)
+    
+    def get_dfs(self, dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+        return self._base_curve.get_dfs(get_ordinals(dates) - self._date_delta.days)
@@ -24,16 +24,21 @@ class CurveInstrument:
     _notional: float = field(kw_only=True, default=1000000)
     exclude_fit: bool = field(kw_only=True, default=False)
     _end: dtm.date = field(init=False)
+    _last_date: dtm.date = field(init=False)
 
     def __post_init__(self):
         if isinstance(self._underlier, RateFuture):
             self._end = self._underlier.expiry
+            self._last_date = self._underlier._rate_end_date
         elif isinstance(self._underlier, SwapTrade):
             self._end = self._underlier.end_date
+            self._last_date = self._underlier.last_date
         elif isinstance(self._underlier, FXSwap):
             self._end = self._underlier.far_settle_date
+            self._last_date = self._end
         elif isinstance(self._underlier, Deposit):
             self._end = self._underlier._end
+            self._last_date = self._end
         if not self._node:
             self._node = self._end
     
@@ -57,6 +62,11 @@ class CurveInstrument:
     def node(self):
         return self._node
     
+    @property
+    def last_date(self):
+        """Last date the instrument needs a discount factor for"""
+        return self._last_date
+    
     def set_node(self, value: dtm.date):
         self._node = value
     
@@ -74,10 +84,27 @@ class CurveInstrument:
             return underlier.get_pv(leg1_forward_curve=curve, leg2_forward_curve=collateral_curve)
         return self._notional * underlier.get_pv(curve)
     
-    def set_convexity(self, *args) -> None:
+    def get_pv_sensitivities(self, curve: RateCurve, collateral_curve: RateCurve = None,
+                             collateral_spot=None) -> list[tuple[RateCurve, dtm.date, float]]:
+        underlier = self._underlier
+        if isinstance(underlier, FXSwap):
+            sensitivities = underlier.get_pv_sensitivities(
+                curve, ref_discount_curve=collateral_curve, spot=collateral_spot)
+            return [(crv, dt, self._notional * sens) for crv, dt, sens in sensitivities]
+        elif isinstance(underlier, DomesticSwap):
+            return underlier.get_pv_sensitivities(forward_curve=curve, discount_curve=collateral_curve)
+        elif isinstance(underlier, BasisSwap):
+            return underlier.get_pv_sensitivities(leg1_forward_curve=curve, leg2_forward_curve=collateral_curve)
+        return [(curve, dt, self._notional * sens) for dt, sens in underlier.get_pv_sensitivities(curve)]
+    
+    def set_convexity(self, *args) -> dtm.date | None:
+        # rate start date is returned when the convexity changes
         if isinstance(self._underlier, RateFuture):
+            convexity = getattr(self._underlier, '_convexity', None)
             self._underlier.set_convexity(*args)
-        return
+            if self._underlier._convexity != convexity:
+                return self._underlier._rate_start_date
+        return None
     
     def is_convexity_swap(self, node_date: dtm.date):
         return isinstance(self._underlier, SwapTrade) and self.exclude_fit and self._underlier.end_date > node_date
@@ -124,9 +151,14 @@ class Deposit(BaseInstrument):
     
     def get_pv(self, curve: RateCurve) -> float:
         start_date = self.start_date(curve.date)
-        fcast_rate = curve.get_forward_rate(start_date, self._end)
+        # forward rate times period fraction is the discount factor ratio
+        fcast_rate = curve.get_df(start_date) / curve.get_df(self._end) - 1
         period_dcf = curve.get_dcf_from(start_date, self._end)
-        fcast_rate *= period_dcf
         fixed_rate = np.exp(self.data[curve.date] * period_dcf) - 1
         return (fcast_rate - fixed_rate)
+    
+    def get_pv_sensitivities(self, curve: RateCurve) -> list[tuple[dtm.date, float]]:
+        start_date = self.start_date(curve.date)
+        df_ratio = curve.get_df(start_date) / curve.get_df(self._end)
+        return [(start_date, df_ratio), (self._end, -df_ratio)]
 
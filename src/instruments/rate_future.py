@@ -2,6 +2,7 @@
 from pydantic.dataclasses import dataclass
 from dataclasses import field
 import datetime as dtm
+import bisect
 import numpy as np
 
 from common.models.future import Future
@@ -10,7 +11,8 @@ from common.chrono.tenor import Tenor
 from common.chrono.daycount import DayCount
 from instruments.rate_curve import RateCurve
 from instruments.vol_curve import VolCurve
-from lib.rate_helper import get_forecast_rate
+from lib.daycount_helper import get_ordinals
+from lib.rate_helper import get_forecast_rate, get_forecast_rate_sensitivities
 from models.data_context import DataContext
 
 
@@ -29,6 +31,9 @@ class RateFuture(Future):
     def get_settle_rate(self, date: dtm.date, curve: RateCurve) -> float:
         "Get settlement rate for RateFuture"
     
+    def get_settle_rate_sensitivities(self, date: dtm.date, curve: RateCurve) -> list[tuple[dtm.date, float]]:
+        "Get settlement rate sensitivities to log discount factors for RateFuture"
+    
     def set_convexity(self, rate_vol_curve: VolCurve, daycount_type: DayCount = DayCount.ACT360) -> None:
         date = rate_vol_curve.date
         if self._rate_start_date <= date:
@@ -46,6 +51,9 @@ class RateFuture(Future):
         settle_rate = self.get_settle_rate(curve.date, curve)
         price = self.data[curve.date]
         return (1 - settle_rate - (price + self._convexity) / 100)
+    
+    def get_pv_sensitivities(self, curve: RateCurve) -> list[tuple[dtm.date, float]]:
+        return [(dt, -sens) for dt, sens in self.get_settle_rate_sensitivities(curve.date, curve)]
 
 @dataclass
 class RateFutureCompound(RateFuture):
@@ -55,6 +63,9 @@ class RateFutureCompound(RateFuture):
     
     def get_settle_rate(self, _: dtm.date, curve: RateCurve) -> float:
         return get_forecast_rate(self._rate_start_date, self._rate_end_date, curve, self.underlying)
+    
+    def get_settle_rate_sensitivities(self, _: dtm.date, curve: RateCurve) -> list[tuple[dtm.date, float]]:
+        return get_forecast_rate_sensitivities(self._rate_start_date, self._rate_end_date, curve, self.underlying)
 
 @dataclass
 class RateFutureAverage(RateFuture):
@@ -77,15 +88,37 @@ class RateFutureAverage(RateFuture):
         settle_rate = 0
         bdates = self.fixing_dates
         context = DataContext()
-        for di in range(0, len(bdates)-1):
-            date_i = bdates[di]
-            date_i_next = bdates[di+1]
-            if date_i >= date:
-                rate_fix = curve.get_forward_rate(date_i, date_i_next)
-            else:
-                rate_fix = context.get_fixing(self.underlying, date_i)
-            settle_rate += rate_fix * (date_i_next - date_i).days
-            date_i = date_i_next
+        fi = 0
+        # seasoned fixings from the index when they are all published
+        fixed_id = bisect.bisect_left(bdates, date, hi=len(bdates)-1)
+        if fixed_id > 0:
+            fixed_sum = context.get_fixing_index(self.underlying, self.calendar).get_simple_sum(
+                bdates[0], bdates[fixed_id])
+            if fixed_sum is not None:
+                settle_rate, fi = fixed_sum, fixed_id
+        while fi < len(bdates)-1 and bdates[fi] < date:
+            rate_fix = context.get_fixing(self.underlying, bdates[fi])
+            settle_rate += rate_fix * (bdates[fi+1] - bdates[fi]).days
+            fi += 1
+        if fi < len(bdates)-1:
+            # forecast fixings in one pass over the curve
+            fwd_rates = curve.get_forward_rates(bdates[fi:-1], bdates[fi+1:])
+            settle_rate += np.dot(fwd_rates, np.diff(get_ordinals(bdates[fi:])))
         
         settle_rate /= (self._rate_end_date - self._rate_start_date).days
         return settle_rate
+    
+    def get_settle_rate_sensitivities(self, date: dtm.date, curve: RateCurve) -> list[tuple[dtm.date, float]]:
+        sensitivities = []
+        bdates = [dt for dt in self.fixing_dates if dt >= date]
+        if len(bdates) < 2:
+            return sensitivities
+        period_days = (self._rate_end_date - self._rate_start_date).days
+        ordinals = get_ordinals(bdates)
+        dfs = curve.get_dfs(ordinals)
+        df_ratios = dfs[:-1] / dfs[1:]
+        weights = np.diff(ordinals) / period_days / curve.get_dcfs_from(ordinals[:-1], ordinals[1:])
+        for di in range(len(bdates)-1):
+            sensitivities.append((bdates[di], df_ratios[di] * weights[di]))
+            sensitivities.append((bdates[di+1], -df_ratios[di] * weights[di]))
+        return sensitivities
@@ -46,27 +46,20 @@ class SwapLegConvention:
     # _notional_pay_delay: str = None
     # _notional_pay_calendar: str = None
 
-    @property
-    def currency(self):
-        return Currency(self._currency)
-    
-    @property
-    def coupon_frequency(self):
-        return Frequency(self._coupon_frequency)
-    
-    @property
-    def daycount_type(self):
-        return DayCount(self._daycount_type)
+    def __post_init__(self):
+        # parsed once when loaded, pricing reads the objects
+        self.__dict__['currency'] = Currency(self._currency)
+        self.__dict__['coupon_frequency'] = Frequency(self._coupon_frequency)
+        self.__dict__['daycount_type'] = DayCount(self._daycount_type)
+        self.__dict__['notional_exchange'] = NotionalExchangeType(self._notional_exchange_type)
+        self.__dict__['_coupon_bd_adjust'] = BDayAdjust(BDayAdjustType(self._coupon_adjust_type), self._coupon_calendar)
+        self.__dict__['_coupon_pay_tenor'] = Tenor((self._coupon_pay_delay, self._coupon_calendar))
     
     def coupon_adjust(self):
-        return BDayAdjust(BDayAdjustType(self._coupon_adjust_type), self._coupon_calendar)
+        return self._coupon_bd_adjust
     
     def coupon_pay_delay(self):
-        return Tenor((self._coupon_pay_delay, self._coupon_calendar))
-    
-    @property
-    def notional_exchange(self):
-        return NotionalExchangeType(self._notional_exchange_type)
+        return self._coupon_pay_tenor
 
 @dataclass(frozen=True)
 class SwapFixLegConvention(SwapLegConvention):
@@ -81,14 +74,20 @@ class SwapFloatLegConvention(SwapLegConvention):
     _reset_frequency: str | None = None
     
     def __post_init__(self):
+        super().__post_init__()
         self.__dict__['fixing'] = RateFixing(RateFixingType(self._fixing_type), name=self._fixing_id)
+        fixing_calendar = self._fixing_calendar if self._fixing_calendar else self._coupon_calendar
+        self.__dict__['_fixing_lag_tenor'] = Tenor((self._fixing_lag, fixing_calendar))
+        self.__dict__['_reset_freq'] = Frequency(self._reset_frequency) if self._reset_frequency else None
     
     def fixing_lag(self):
-        fixing_calendar = self._fixing_calendar if self._fixing_calendar else self._coupon_calendar
-        return Tenor((self._fixing_lag, fixing_calendar))
+        return self._fixing_lag_tenor
     
     def reset_frequency(self):
-        return Frequency(self._reset_frequency)
+        return self._reset_freq
+    
+    def is_rfr(self) -> bool:
+        return self._fixing_type == RateFixingType.RFR
     
     def is_interim_reset(self) -> bool:
         return self._fixing_type == RateFixingType.IBOR and self._reset_frequency \
@@ -104,8 +103,11 @@ class SwapConvention:
     _leg1: SwapLegConvention
     _leg2: SwapLegConvention
     
+    def __post_init__(self):
+        self.__dict__['_spot_delay_tenor'] = Tenor((self._spot_delay, self._spot_calendar))
+    
     def spot_delay(self):
-        return Tenor((self._spot_delay, self._spot_calendar))
+        return self._spot_delay_tenor
     
     @property
     def leg1(self):
@@ -1,10 +1,14 @@
 from pydantic.dataclasses import dataclass
 from dataclasses import field
 import datetime as dtm
+import numpy as np
 
 from instruments.rate_curve import RateCurve
-from lib.rate_helper import get_forecast_rate
+from lib import daycount_helper as dcf_lib
+from lib.daycount_helper import get_ordinals
+from lib.rate_helper import get_forecast_rate, get_forecast_rate_sensitivities
 from .convention import SwapLegConvention, SwapFloatLegConvention
+from .schedule import get_coupon_schedule, get_fixing_periods
 
 @dataclass
 class SwapLeg:
@@ -17,43 +21,68 @@ class SwapLeg:
     coupon_pay_dates: list[dtm.date] = field(init=False)
     
     def __post_init__(self):
-        self.coupon_dates = self._convention.coupon_frequency.generate_schedule(
-            self._start_date, self._end_date, bd_adjust=self._convention.coupon_adjust())
-        pay_delay = self._convention.coupon_pay_delay()
-        self.coupon_pay_dates = [pay_delay.get_date(rd) for rd in self.coupon_dates]
+        coupon_dates, coupon_pay_dates = get_coupon_schedule(self._convention, self._start_date, self._end_date)
+        self.coupon_dates = list(coupon_dates)
+        self.coupon_pay_dates = list(coupon_pay_dates)
+        self._coupon_dcfs = dcf_lib.get_dcfs(self._convention.daycount_type,
+                                             [self._start_date] + self.coupon_dates[:-1], self.coupon_dates)
+        # coupon pay dates then notional exchange dates, discounted in one curve lookup
+        exchange_dates = ([self._start_date] if self.notional_exchange.initial else []) + \
+            ([self._end_date] if self.notional_exchange.final else [])
+        self._discount_ordinals = get_ordinals(self.coupon_pay_dates + exchange_dates)
     
     @property
     def notional_exchange(self):
         return self._convention.notional_exchange
     
+    @property
+    def last_date(self) -> dtm.date:
+        return max(self._end_date, self.coupon_pay_dates[-1])
+    
     def get_dcf(self, from_date: dtm.date, to_date: dtm.date) -> float:
-        return self._convention.daycount_type.get_dcf(from_date, to_date)
+        return dcf_lib.get_dcf(self._convention.daycount_type, from_date, to_date)
     
     def get_pv(self) -> float:
         """Get PV for Swap Leg"""
 
+    def get_discount_factors(self, discount_curve: RateCurve) -> tuple[np.ndarray, float]:
+        """Discount factors on coupon pay dates and PV of notional exchanges"""
+        dfs = discount_curve.get_dfs(self._discount_ordinals)
+        coupon_count = len(self.coupon_dates)
+        return dfs[:coupon_count], self._notional * dfs[coupon_count:].sum()
+
     def get_annuity(self, discount_curve: RateCurve) -> float:
-        annuity = 0
-        accrual_start_date = self._start_date
-        for cp_i in range(len(self.coupon_dates)):
-            cp_d_i = self.coupon_dates[cp_i]
-            cp_pd_i = self.coupon_pay_dates[cp_i]
-            annuity += self._notional * self.get_dcf(accrual_start_date, cp_d_i) * discount_curve.get_df(cp_pd_i)
-            accrual_start_date = cp_d_i
-        return annuity
+        coupon_dfs, _ = self.get_discount_factors(discount_curve)
+        return self._notional * np.dot(self._coupon_dcfs, coupon_dfs)
+    
+    def get_annuity_sensitivities(self, discount_curve: RateCurve) -> list[tuple[RateCurve, dtm.date, float]]:
+        coupon_dfs, _ = self.get_discount_factors(discount_curve)
+        return [(discount_curve, cp_pd_i, sens) for cp_pd_i, sens in
+                zip(self.coupon_pay_dates, (self._notional * self._coupon_dcfs * coupon_dfs).tolist())]
 
 @dataclass
 class SwapFixLeg(SwapLeg):
     _rate: float = field(init=False)
 
+    def get_pv_annuity(self, discount_curve: RateCurve) -> tuple[float, float]:
+        coupon_dfs, exchange_pv = self.get_discount_factors(discount_curve)
+        annuity = self._notional * np.dot(self._coupon_dcfs, coupon_dfs)
+        return exchange_pv + annuity * self._rate, annuity
+    
     def get_pv(self, discount_curve: RateCurve) -> float:
-        pv = 0
+        return self.get_pv_annuity(discount_curve)[0]
+    
+    def get_pv_sensitivities(self, discount_curve: RateCurve) -> list[tuple[RateCurve, dtm.date, float]]:
+        sensitivities = []
         if self.notional_exchange.initial:
-            pv += self._notional * discount_curve.get_df(self._start_date)
-        pv += self.get_annuity(discount_curve=discount_curve) * self._rate
+            sensitivities.append((discount_curve, self._start_date,
+                                  self._notional * discount_curve.get_df(self._start_date)))
+        for crv, dt, sens in self.get_annuity_sensitivities(discount_curve=discount_curve):
+            sensitivities.append((crv, dt, sens * self._rate))
         if self.notional_exchange.final:
-            pv += self._notional * discount_curve.get_df(self._end_date)
-        return pv
+            sensitivities.append((discount_curve, self._end_date,
+                                  self._notional * discount_curve.get_df(self._end_date)))
+        return sensitivities
 
 @dataclass
 class SwapFloatLeg(SwapLeg):
@@ -61,49 +90,119 @@ class SwapFloatLeg(SwapLeg):
     _spread: float = field(init=False, default=0)
 
     fixing_periods: list[tuple[tuple[dtm.date, dtm.date], tuple[dtm.date, dtm.date]]] = field(init=False)
+    _fixing_dcfs: list[list[float]] = field(init=False)
     
     def __post_init__(self):
         super().__post_init__()
-        accrual_dates = [self._start_date] + self.coupon_dates
-        fixing_periods = [[] for _ in range(len(self.coupon_dates))]
-        fixing_lag = self._convention.fixing_lag()
+        fixing_periods = get_fixing_periods(self._convention, self._start_date, self._end_date)
+        self.fixing_periods = [list(cp_periods) for cp_periods in fixing_periods]
+        # accrual fraction of each fixing period
+        self._fixing_dcfs = [[self.get_dcf(fix_i[1][0], fix_i[1][1]) for fix_i in cp_periods]
+                             for cp_periods in fixing_periods]
+        self._fixing_start_ordinals, self._fixing_end_ordinals = None, None
+        self._accrual_dcfs, self._is_rfr = None, False
         if self._convention.is_interim_reset():
-            reset_freq = self._convention.reset_frequency()
-            for a_id in range(1, len(accrual_dates)):
-                reset_dates = reset_freq.generate_schedule(
-                    accrual_dates[a_id-1], accrual_dates[a_id],
-                    step_backward=False, bd_adjust=self._convention.coupon_adjust())
-                fixing_dates = [fixing_lag.get_date(rd) for rd in reset_dates]
-                for f_id in range(1, len(fixing_dates)):
-                    fixing_periods[a_id-1].append((
-                        (fixing_dates[f_id-1], fixing_dates[f_id]),
-                        (reset_dates[f_id-1], reset_dates[f_id])))
-        else:
-            fixing_dates = [fixing_lag.get_date(ad) for ad in accrual_dates]
-            for f_id in range(1, len(fixing_dates)):
-                fixing_periods[f_id-1].append((
-                    (fixing_dates[f_id-1], fixing_dates[f_id]),
-                    (accrual_dates[f_id-1], accrual_dates[f_id])))
-        self.fixing_periods = fixing_periods
+            return
+        # one fixing period per coupon
+        self._fixing_start_ordinals = get_ordinals([cp_periods[0][0][0] for cp_periods in fixing_periods])
+        self._fixing_end_ordinals = get_ordinals([cp_periods[0][0][1] for cp_periods in fixing_periods])
+        self._accrual_dcfs = np.array([dcfs[0] for dcfs in self._fixing_dcfs])
+        # compounded overnight rates telescope to a discount factor ratio over the fixing period
+        self._is_rfr = self._convention.is_rfr()
 
     @property
     def fixing(self):
         return self._convention.fixing
     
+    @property
+    def last_date(self) -> dtm.date:
+        return max(super().last_date, self.fixing_periods[-1][-1][0][1])
+    
+    def _get_forward_mask(self, forward_curve: RateCurve) -> np.ndarray:
+        """Coupons with a single fixing period starting on or after the curve date"""
+        if self._fixing_start_ordinals is None:
+            return np.zeros(len(self.coupon_dates), dtype=bool)
+        return self._fixing_start_ordinals >= forward_curve.date.toordinal()
+    
+    def _get_df_ratios(self, forward_curve: RateCurve, mask: np.ndarray) -> np.ndarray:
+        start_ordinals = self._fixing_start_ordinals[mask]
+        dfs = forward_curve.get_dfs(np.concatenate((start_ordinals, self._fixing_end_ordinals[mask])))
+        return dfs[:len(start_ordinals)] / dfs[len(start_ordinals):]
+    
+    def _get_rfr_scales(self, forward_curve: RateCurve, mask: np.ndarray) -> np.ndarray:
+        """Accrual fraction over fixing period fraction, the latter on the curve day count as compounding uses"""
+        return self._accrual_dcfs[mask] / forward_curve.get_dcfs_from(
+            self._fixing_start_ordinals[mask], self._fixing_end_ordinals[mask])
+    
+    def _get_seasoned_forecast_rate(self, cp_i: int, forward_curve: RateCurve) -> float:
+        forecast_rate = 0
+        for fix_i, accrual_dcf in zip(self.fixing_periods[cp_i], self._fixing_dcfs[cp_i]):
+            forecast_rate = (1 + forecast_rate) * \
+                            (1 + get_forecast_rate(fix_i[0][0], fix_i[0][1], forward_curve, self.fixing) * \
+                                accrual_dcf) - 1
+        return forecast_rate
+    
+    def get_forecast_rates(self, forward_curve: RateCurve) -> np.ndarray:
+        """Forecast coupon rates times accrual fraction"""
+        forecast_rates = np.zeros(len(self.coupon_dates))
+        forward_mask = self._get_forward_mask(forward_curve)
+        if forward_mask.any():
+            if self._is_rfr:
+                forecast_rates[forward_mask] = (self._get_df_ratios(forward_curve, forward_mask) - 1) * \
+                    self._get_rfr_scales(forward_curve, forward_mask)
+            else:
+                forecast_rates[forward_mask] = forward_curve.get_forward_rates(
+                    self._fixing_start_ordinals[forward_mask], self._fixing_end_ordinals[forward_mask]) * \
+                    self._accrual_dcfs[forward_mask]
+        for cp_i in np.flatnonzero(~forward_mask):
+            forecast_rates[cp_i] = self._get_seasoned_forecast_rate(cp_i, forward_curve)
+        return forecast_rates
+    
     def get_pv(self, discount_curve: RateCurve, forward_curve: RateCurve = None) -> float:
         if not forward_curve:
             forward_curve = discount_curve
-        pv = 0
+        coupon_dfs, exchange_pv = self.get_discount_factors(discount_curve)
+        return exchange_pv + self._notional * np.dot(self.get_forecast_rates(forward_curve) + self._spread, coupon_dfs)
+    
+    def get_pv_sensitivities(self, discount_curve: RateCurve,
+                             forward_curve: RateCurve = None) -> list[tuple[RateCurve, dtm.date, float]]:
+        if not forward_curve:
+            forward_curve = discount_curve
+        sensitivities = []
         if self.notional_exchange.initial:
-            pv += self._notional * discount_curve.get_df(self._start_date)
+            sensitivities.append((discount_curve, self._start_date,
+                                  self._notional * discount_curve.get_df(self._start_date)))
+        coupon_dfs, _ = self.get_discount_factors(discount_curve)
+        rfr_mask = self._get_forward_mask(forward_curve) if self._is_rfr \
+            else np.zeros(len(self.coupon_dates), dtype=bool)
+        rfr_df_ratios, rfr_scales = np.ones(len(self.coupon_dates)), np.zeros(len(self.coupon_dates))
+        if rfr_mask.any():
+            rfr_df_ratios[rfr_mask] = self._get_df_ratios(forward_curve, rfr_mask)
+            rfr_scales[rfr_mask] = self._get_rfr_scales(forward_curve, rfr_mask)
         for cp_i in range(len(self.coupon_dates)):
-            forecast_rate = 0
-            for fix_i in self.fixing_periods[cp_i]:
-                forecast_rate = (1 + forecast_rate) * \
-                                (1 + get_forecast_rate(fix_i[0][0], fix_i[0][1], forward_curve, self.fixing) * \
-                                    self.get_dcf(fix_i[1][0], fix_i[1][1])) - 1
-            pv += self._notional * (forecast_rate + self._spread) * \
-                    discount_curve.get_df(self.coupon_pay_dates[cp_i])
+            if rfr_mask[cp_i]:
+                fix_start, fix_end = self.fixing_periods[cp_i][0][0]
+                df_ratio = rfr_df_ratios[cp_i]
+                forecast_rate = (df_ratio - 1) * rfr_scales[cp_i]
+                forecast_sensitivities = [(fix_start, df_ratio * rfr_scales[cp_i]),
+                                          (fix_end, -df_ratio * rfr_scales[cp_i])]
+            else:
+                forecast_rate = 0
+                forecast_sensitivities = []
+                for fix_i, accrual_dcf in zip(self.fixing_periods[cp_i], self._fixing_dcfs[cp_i]):
+                    period_rate = get_forecast_rate(fix_i[0][0], fix_i[0][1], forward_curve, self.fixing) * accrual_dcf
+                    period_sensitivities = get_forecast_rate_sensitivities(
+                        fix_i[0][0], fix_i[0][1], forward_curve, self.fixing)
+                    # product rule on compounded periods
+                    forecast_sensitivities = [(dt, sens * (1 + period_rate)) for dt, sens in forecast_sensitivities] + \
+                        [(dt, sens * (1 + forecast_rate) * accrual_dcf) for dt, sens in period_sensitivities]
+                    forecast_rate = (1 + forecast_rate) * (1 + period_rate) - 1
+            cp_pd_i = self.coupon_pay_dates[cp_i]
+            pay_df = coupon_dfs[cp_i]
+            sensitivities.append((discount_curve, cp_pd_i, self._notional * (forecast_rate + self._spread) * pay_df))
+            for dt, sens in forecast_sensitivities:
+                sensitivities.append((forward_curve, dt, self._notional * sens * pay_df))
         if self.notional_exchange.final:
-            pv += self._notional * discount_curve.get_df(self._end_date)
-        return pv
+            sensitivities.append((discount_curve, self._end_date,
+                                  self._notional * discount_curve.get_df(self._end_date)))
+        return sensitivities
@@ -0,0 +1,63 @@
+import datetime as dtm
+import functools
+from typing import NamedTuple
+
+from .convention import SwapLegConvention, SwapFloatLegConvention
+
+# legs of a convention are shared across tenors and trade dates in backfills
+# schedules are keyed by the calendar IDs of a convention, not their holidays,
+# so calendars must be loaded before any leg is built and clear_cache called if they are reloaded
+SCHEDULE_CACHE_SIZE = 4096
+
+
+class ScheduleCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+@functools.lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def get_coupon_schedule(convention: SwapLegConvention, start_date: dtm.date,
+                        end_date: dtm.date) -> tuple[tuple[dtm.date, ...], tuple[dtm.date, ...]]:
+    """Coupon dates and pay dates"""
+    coupon_dates = convention.coupon_frequency.generate_schedule(
+        start_date, end_date, bd_adjust=convention.coupon_adjust())
+    pay_delay = convention.coupon_pay_delay()
+    return tuple(coupon_dates), tuple(pay_delay.get_date(rd) for rd in coupon_dates)
+
+@functools.lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def get_fixing_periods(convention: SwapFloatLegConvention, start_date: dtm.date,
+                       end_date: dtm.date) -> tuple[tuple[tuple[tuple[dtm.date, dtm.date], tuple[dtm.date, dtm.date]], ...], ...]:
+    """Fixing and accrual periods for each coupon"""
+    accrual_dates = [start_date] + list(get_coupon_schedule(convention, start_date, end_date)[0])
+    fixing_periods = [[] for _ in range(len(accrual_dates)-1)]
+    fixing_lag = convention.fixing_lag()
+    if convention.is_interim_reset():
+        reset_freq = convention.reset_frequency()
+        for a_id in range(1, len(accrual_dates)):
+            reset_dates = reset_freq.generate_schedule(
+                accrual_dates[a_id-1], accrual_dates[a_id],
+                step_backward=False, bd_adjust=convention.coupon_adjust())
+            fixing_dates = [fixing_lag.get_date(rd) for rd in reset_dates]
+            for f_id in range(1, len(fixing_dates)):
+                fixing_periods[a_id-1].append((
+                    (fixing_dates[f_id-1], fixing_dates[f_id]),
+                    (reset_dates[f_id-1], reset_dates[f_id])))
+    else:
+        fixing_dates = [fixing_lag.get_date(ad) for ad in accrual_dates]
+        for f_id in range(1, len(fixing_dates)):
+            fixing_periods[f_id-1].append((
+                (fixing_dates[f_id-1], fixing_dates[f_id]),
+                (accrual_dates[f_id-1], accrual_dates[f_id])))
+    return tuple(tuple(cp_periods) for cp_periods in fixing_periods)
+
+def get_cache_info() -> dict[str, ScheduleCacheInfo]:
+    return {
+        'coupon': ScheduleCacheInfo(*get_coupon_schedule.cache_info()),
+        'fixing': ScheduleCacheInfo(*get_fixing_periods.cache_info()),
+    }
+
+def clear_cache() -> None:
+    get_coupon_schedule.cache_clear()
+    get_fixing_periods.cache_clear()
@@ -26,6 +26,10 @@ class SwapTrade(BaseInstrument):
     def start_date(self):
         return self._start_date
 
+    @property
+    def last_date(self) -> dtm.date:
+        return max(self._leg1.last_date, self._leg2.last_date)
+
     @property
     def notional(self):
         return self._notional
@@ -75,11 +79,20 @@ class DomesticSwap(SwapTrade):
         float_pv = self.float_leg.get_pv(forward_curve=forward_curve, discount_curve=discount_curve)
         return self.fix_leg.get_pv(discount_curve) + float_pv
     
+    def get_pv_sensitivities(self, forward_curve: RateCurve,
+                             discount_curve: RateCurve = None) -> list[tuple[RateCurve, dtm.date, float]]:
+        if not discount_curve:
+            discount_curve = forward_curve
+        return self.fix_leg.get_pv_sensitivities(discount_curve) + \
+            self.float_leg.get_pv_sensitivities(forward_curve=forward_curve, discount_curve=discount_curve)
+    
     def get_par(self, forward_curve: RateCurve, discount_curve: RateCurve = None) -> float:
         if not discount_curve:
             discount_curve = forward_curve
-        pv = self.get_pv(forward_curve=forward_curve, discount_curve=discount_curve)
-        return self.data[forward_curve.date] * self._units - pv / self.fix_leg.get_annuity(discount_curve)
+        # fix leg PV and annuity share the discount factors
+        fix_pv, annuity = self.fix_leg.get_pv_annuity(discount_curve)
+        pv = fix_pv + self.float_leg.get_pv(forward_curve=forward_curve, discount_curve=discount_curve)
+        return self.data[forward_curve.date] * self._units - pv / annuity
 
     def get_pv01(self, discount_curve: RateCurve) -> float:
         return self.fix_leg.get_annuity(discount_curve) / 10000
@@ -117,6 +130,14 @@ class BasisSwap(SwapTrade):
         leg1_pv = self._leg1.get_pv(forward_curve=leg1_forward_curve, discount_curve=discount_curve)
         leg2_pv = self._leg2.get_pv(forward_curve=leg2_forward_curve, discount_curve=discount_curve)
         return leg1_pv + leg2_pv
+    
+    def get_pv_sensitivities(self,
+                             leg1_forward_curve: RateCurve, leg2_forward_curve: RateCurve,
+                             discount_curve: RateCurve = None) -> list[tuple[RateCurve, dtm.date, float]]:
+        if not discount_curve:
+            discount_curve = leg2_forward_curve
+        return self._leg1.get_pv_sensitivities(forward_curve=leg1_forward_curve, discount_curve=discount_curve) + \
+            self._leg2.get_pv_sensitivities(forward_curve=leg2_forward_curve, discount_curve=discount_curve)
 
     def get_par(self,
                 leg1_forward_curve: RateCurve, leg2_forward_curve: RateCurve,
@@ -2,10 +2,12 @@ from pydantic.dataclasses import dataclass
 from dataclasses import field
 from dataclasses import InitVar
 import datetime as dtm
+import bisect
+import numpy as np
 
 from common.base_class import NameDateClass
 
-from lib.interpolator import Interpolator
+from lib.interpolator import Interpolator, get_values
 from instruments.base_types import DataPoint
 
 
@@ -26,15 +28,18 @@ class VolCurve(NameDateClass):
     def _date_to_float(self, date: dtm.date) -> float:
         return (date - self.date).days / 365
 
-    def _set_interpolator(self) -> None:
+    def _set_interpolator(self, reset: bool = True) -> None:
         knots = [(self._date_to_float(nd.date), nd.value) for nd in self._nodes]
-        self._interpolator = self._interpolator_class(knots)
+        if reset:
+            self._interpolator = self._interpolator_class(knots)
+        else:
+            self._interpolator.update(knots)
     
     def update_node(self, date: dtm.date, value: float) -> None:
         for ni, node in enumerate(self._nodes):
             if node.date == date:
                 self._nodes[ni] = DataPoint(date, value)
-                self._set_interpolator()
+                self._set_interpolator(reset=False)
                 return
         raise KeyError(f"Invalid date {date} to set node")
     
@@ -44,9 +49,16 @@ class VolCurve(NameDateClass):
                 return node.value
         raise KeyError(f"Invalid date {date} to get node")
     
+    @property
+    def nodes(self):
+        return self._nodes
+    
     def add_node(self, date: dtm.date, value: float) -> None:
-        self._nodes.append(DataPoint(date, value))
-        self._set_interpolator()
+        bisect.insort(self._nodes, DataPoint(date, value), key=lambda nd: nd.date)
+        self._set_interpolator(reset=False)
     
     def get_vol(self, date: dtm.date) -> float:
         return self._interpolator.get_value(self._date_to_float(date))
+    
+    def get_vols(self, dates: list[dtm.date]) -> np.ndarray:
+        return get_values(self._interpolator, [self._date_to_float(dt) for dt in dates])
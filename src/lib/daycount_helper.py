@@ -0,0 +1,31 @@
+import datetime as dtm
+import numpy as np
+
+from common.chrono.daycount import DayCount
+
+# daycounts with fraction proportional to calendar days
+ACT_DAYCOUNTS = (DayCount.ACT360, DayCount.ACT365)
+DCF_UNITS = {dc: dc.get_unit_dcf() for dc in ACT_DAYCOUNTS}
+
+
+def get_ordinals(dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+    """Date ordinals from dates or ordinals"""
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.integer):
+        return dates
+    return np.fromiter((d if isinstance(d, int) else d.toordinal() for d in dates), dtype=int, count=len(dates))
+
+def get_dcf(daycount: DayCount, from_date: dtm.date, to_date: dtm.date) -> float:
+    dcf_unit = DCF_UNITS.get(daycount)
+    if dcf_unit is None:
+        return daycount.get_dcf(from_date, to_date)
+    return (to_date.toordinal() - from_date.toordinal()) * dcf_unit
+
+def get_dcfs(daycount: DayCount, from_dates: list[dtm.date] | np.ndarray,
+             to_dates: list[dtm.date] | np.ndarray) -> np.ndarray:
+    """Day count fractions between arrays of dates or ordinals"""
+    from_ordinals, to_ordinals = get_ordinals(from_dates), get_ordinals(to_dates)
+    dcf_unit = DCF_UNITS.get(daycount)
+    if dcf_unit is None:
+        return np.array([daycount.get_dcf(dtm.date.fromordinal(int(fo)), dtm.date.fromordinal(int(to)))
+                         for fo, to in zip(from_ordinals, to_ordinals)], dtype=float)
+    return (to_ordinals - from_ordinals) * dcf_unit
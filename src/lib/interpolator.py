@@ -4,10 +4,12 @@ import numpy as np
 import bisect
 
 from common.numeric.interpolator import *
-from common.numeric import solver
 
 fromString_super = Interpolator.fromString
 
+FLAT_RATE_MAX_ITERATIONS = 20
+FLAT_RATE_TOLERANCE = 1e-14
+
 def fromString(type: str):
     if type == 'Default':
         return LogCubicSplineNatural
@@ -19,6 +21,8 @@ def fromString(type: str):
         return FlatRate
     elif type == 'FlatRateBD':
         return FlatRateBD
+    elif type == 'LogAkima':
+        return LogAkima
     else:
         return fromString_super(type=type)
 
@@ -27,20 +31,49 @@ Interpolator.fromString = fromString
 
 @dataclass
 class RootMeanSquare(Interpolator):
+
+    def __post_init__(self, xy_init):
+        super().__post_init__(xy_init)
+        self._variances = np.zeros(0)
+        self._set_variances(0)
+
+    def update(self, xy_init):
+        xs_prev, ys_prev = list(self._xs), list(self._ys)
+        super().__post_init__(xy_init)
+        from_id = 0
+        while from_id < min(len(xs_prev), len(self._xs)) and \
+                xs_prev[from_id] == self._xs[from_id] and ys_prev[from_id] == self._ys[from_id]:
+            from_id += 1
+        self._set_variances(from_id)
+
+    def _set_variances(self, from_id: int) -> None:
+        # integrated variance till each knot, a knot value applies till the next knot
+        xs, ys = np.array(self._xs, dtype=float), np.array(self._ys, dtype=float)
+        variances = np.zeros(len(xs))
+        from_id = max(min(from_id, len(self._variances), len(xs)), 1)
+        variances[:from_id] = self._variances[:from_id] if from_id <= len(self._variances) else 0
+        variances[from_id:] = variances[from_id-1] + \
+            np.cumsum(ys[from_id-1:-1] ** 2 * np.diff(xs[from_id-1:]))
+        self._variances = variances
     
     def get_value(self, x: float) -> float:
         super()._get_value(x)
 
         if len(self._xs) == 1 or x <= self._xs[1]:
             return self._ys[0]
-        res = 0
-        for i in range(1, len(self._ys)):
-            if x < self._xs[i]:
-                i -= 1
-                break
-            res += (self._ys[i-1] ** 2) * (self._xs[i] - self._xs[i-1]) / (x - self._xs[0])
-        res += (self._ys[i] ** 2) * (x - self._xs[i]) / (x - self._xs[0])
-        return np.sqrt(res)
+        i = bisect.bisect_right(self._xs, x) - 1
+        res = self._variances[i] + (self._ys[i] ** 2) * (x - self._xs[i])
+        return np.sqrt(res / (x - self._xs[0]))
+    
+    def get_values(self, xs: np.ndarray) -> np.ndarray:
+        xs = np.asarray(xs, dtype=float)
+        knot_xs, knot_ys = np.array(self._xs, dtype=float), np.array(self._ys, dtype=float)
+        if len(knot_xs) == 1:
+            return np.full(len(xs), knot_ys[0])
+        ids = np.maximum(np.searchsorted(knot_xs, xs, side='right') - 1, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.sqrt((self._variances[ids] + knot_ys[ids] ** 2 * (xs - knot_xs[ids])) / (xs - knot_xs[0]))
+        return np.where(xs <= knot_xs[1], knot_ys[0], values)
 
 
 @dataclass
@@ -63,56 +96,60 @@ class FlatRate(Interpolator):
 class FlatRateBD(Interpolator):
     _dcfs: list[float]
 
-    _cached_step_rate: dict[tuple[tuple[float, float], tuple[float, float]], float] = field(init=False)
-
     def __post_init__(self, xy_init):
+        self._dcfs_array = np.array(self._dcfs, dtype=float)
+        # solved step rates keyed by their period knots, replaced on each update
+        self._step_keys = []
+        self._step_rates = np.zeros(0)
         self.update(xy_init)
-        # cached attributes
-        self._cached_step_rate = {}
 
     def update(self, xy_init):
         super().__post_init__(xy_init)
+        self._set_step_rates()
 
-    def _get_dcf(self, from_x: float, to_x: float) -> float:
-        si = bisect.bisect_left(self._dcfs, from_x)
-        ei = bisect.bisect_left(self._dcfs, to_x)
-        dcf_p = from_x
-        for xi in range(si+1, ei+1):
-            yield self._dcfs[xi] - dcf_p
-            dcf_p = self._dcfs[xi]
-        yield to_x - dcf_p
-
-    def _step_df(self, period_rate: float, from_x: float, to_x: float) -> float:
-        df = 1
-        for dcf_i in self._get_dcf(from_x, to_x):
-            df /= (1 + period_rate * dcf_i)
-        return df
-    
-    def _step_df_prime(self, period_rate: float, from_x: float, to_x: float, _: float) -> float:
-        df = 1
-        df_mult = 0
-        for dcf_i in self._get_dcf(from_x, to_x):
-            df_i = 1 / (1 + period_rate * dcf_i)
-            df_mult -= df_i * dcf_i
-            df *= df_i
-        return df_mult * df
-    
-    def _step_df_error(self,
-                       period_rate: float,
-                       from_x: float, to_x: float,
-                       period_df: float) -> float:
-        return self._step_df(period_rate, from_x, to_x) - period_df
-    
-    def _eval_period_rate(self, df_period: float, from_x: float, to_x: float) -> float:
-        dcf_period = to_x-from_x
-        l_limit = -np.log(df_period) / dcf_period
-        # u_limit = (1 / df_period - 1) / dcf_period
-        return solver.find_root(
-                self._step_df_error,
-                args=(from_x, to_x, df_period),
-                # bracket=[l_limit, u_limit],
-                init_guess=l_limit, f_prime=self._step_df_prime,
-            )
+    def _set_step_rates(self) -> None:
+        xs, ys, dcfs = np.array(self._xs, dtype=float), np.array(self._ys, dtype=float), self._dcfs_array
+        n_periods = len(xs) - 1
+        step_keys = list(zip(self._xs[:-1], self._ys[:-1], self._xs[1:], self._ys[1:]))
+        cached_rates = dict(zip(self._step_keys, self._step_rates))
+        start_ids = np.searchsorted(dcfs, xs[:-1], side='left')
+        end_ids = np.searchsorted(dcfs, xs[1:], side='left')
+        # business day steps of each period from its start knot to the business day on or after its end knot
+        grid_period = np.full(len(dcfs), -1)
+        for pi in range(n_periods):
+            grid_period[start_ids[pi]+1 : end_ids[pi]+1] = pi
+        grid_ids = np.nonzero(grid_period >= 0)[0]
+        step_periods = grid_period[grid_ids]
+        step_prev = np.where(grid_ids == start_ids[step_periods] + 1, xs[step_periods], dcfs[grid_ids-1])
+        step_dcfs = dcfs[grid_ids] - step_prev
+        # last step back from the business day to the end knot
+        last_dcfs = xs[1:] - np.where(end_ids > start_ids, dcfs[np.minimum(end_ids, len(dcfs)-1)], xs[:-1])
+        
+        log_df_periods = np.log(ys[1:] / ys[:-1])
+        rates = np.array([cached_rates.get(key, np.nan) for key in step_keys], dtype=float)
+        solve_mask = np.isnan(rates)
+        rates[solve_mask] = -log_df_periods[solve_mask] / (xs[1:] - xs[:-1])[solve_mask]
+        # Newton on all changed periods together
+        for _ in range(FLAT_RATE_MAX_ITERATIONS):
+            if not solve_mask.any():
+                break
+            step_rates = rates[step_periods]
+            error = np.bincount(step_periods, -np.log1p(step_rates * step_dcfs), minlength=n_periods) - \
+                np.log1p(rates * last_dcfs) - log_df_periods
+            error_prime = np.bincount(step_periods, -step_dcfs / (1 + step_rates * step_dcfs), minlength=n_periods) - \
+                last_dcfs / (1 + rates * last_dcfs)
+            delta = np.where(solve_mask, error / error_prime, 0)
+            rates -= delta
+            if np.abs(delta).max() < FLAT_RATE_TOLERANCE:
+                break
+        self._step_keys = step_keys
+        self._step_rates = rates
+        self._start_ids = start_ids
+        # log values on business days of each period
+        step_log_dfs = np.cumsum(-np.log1p(rates[step_periods] * step_dcfs))
+        period_offsets = np.concatenate(([0], step_log_dfs))[np.searchsorted(step_periods, np.arange(n_periods))]
+        self._grid_log_dfs = np.full(len(dcfs), np.nan)
+        self._grid_log_dfs[grid_ids] = np.log(ys[step_periods]) + step_log_dfs - period_offsets[step_periods]
     
     def get_value(self, x: float) -> float:
         super()._get_value(x)
@@ -121,14 +158,28 @@ class FlatRateBD(Interpolator):
         ih = bisect.bisect_left(self._xs, x)
         if x == self._xs[ih]:
             return self._ys[ih]
-        step_key = ((self._xs[ih-1], self._ys[ih-1]), (self._xs[ih], self._ys[ih]))
-        if step_key in self._cached_step_rate:
-            step_rate = self._cached_step_rate[step_key]
-        else:
-            df_period = self._ys[ih] / self._ys[ih-1]
-            step_rate = self._eval_period_rate(df_period, from_x=self._xs[ih-1], to_x=self._xs[ih])
-            self._cached_step_rate[step_key] = step_rate
-        return self._ys[ih-1] * self._step_df(step_rate, self._xs[ih-1], x)
+        step_rate = self._step_rates[ih-1]
+        ei = bisect.bisect_left(self._dcfs, x)
+        if ei > self._start_ids[ih-1]:
+            return np.exp(self._grid_log_dfs[ei]) / (1 + step_rate * (x - self._dcfs[ei]))
+        return self._ys[ih-1] / (1 + step_rate * (x - self._xs[ih-1]))
+    
+    def get_values(self, xs: np.ndarray) -> np.ndarray:
+        xs = np.asarray(xs, dtype=float)
+        knot_xs, knot_ys, dcfs = np.array(self._xs, dtype=float), np.array(self._ys, dtype=float), self._dcfs_array
+        if len(xs) and (xs.max() > knot_xs[-1] or xs.min() < knot_xs[0]):
+            raise IndexError("Out of node bounds for flat rate")
+        ih = np.searchsorted(knot_xs, xs, side='left')
+        on_knot = knot_xs[ih] == xs
+        pi = np.maximum(ih-1, 0)
+        step_rates = self._step_rates[pi] if len(self._step_rates) else np.zeros(len(xs))
+        ei = np.minimum(np.searchsorted(dcfs, xs, side='left'), len(dcfs)-1)
+        on_grid = ei > self._start_ids[pi] if len(self._start_ids) else np.zeros(len(xs), dtype=bool)
+        values = np.where(
+            on_grid,
+            np.exp(np.where(on_grid, self._grid_log_dfs[ei], 0)) / (1 + step_rates * (xs - dcfs[ei])),
+            knot_ys[pi] / (1 + step_rates * (xs - knot_xs[pi])))
+        return np.where(on_knot, knot_ys[ih], values)
 
 
 @dataclass
@@ -138,19 +189,47 @@ class MonotoneConvex(Interpolator):
     def __post_init__(self, xy_init):
         super().__post_init__(xy_init)
         n = len(self._ys)
-        self.fds = [0] + [-np.log(self._ys[i] / self._ys[i-1]) / (self._xs[i] - self._xs[i-1]) for i in range(1, n)]
+        self.fds = [0] * n
         self.fs = [0] * n
-        for i in range(1, n-1):
-            self.fs[i] = (self._xs[i] - self._xs[i-1]) / (self._xs[i+1] - self._xs[i-1]) * self.fds[i+1] + \
-                (self._xs[i+1] - self._xs[i]) / (self._xs[i+1] - self._xs[i-1]) * self.fds[i]
+        self._set_forwards(range(n))
+
+    def update(self, xy_init):
+        xs_prev, ys_prev = list(self._xs), list(self._ys)
+        super().__post_init__(xy_init)
+        n = len(self._ys)
+        if len(xs_prev) != n or any(x_prev != x for x_prev, x in zip(xs_prev, self._xs)):
+            self.fds = [0] * n
+            self.fs = [0] * n
+            self._set_forwards(range(n))
+        else:
+            self._set_forwards([i for i in range(n) if ys_prev[i] != self._ys[i]])
+
+    def _set_forwards(self, knot_ids: list[int]) -> None:
+        # discrete forwards either side of a knot and instantaneous forwards at its neighbours change
+        xs, ys, n = self._xs, self._ys, len(self._ys)
+        fd_ids = sorted({i for k in knot_ids for i in (k, k+1) if 1 <= i < n})
+        f_ids = sorted({i for k in knot_ids for i in (k-1, k, k+1) if 1 <= i < n-1})
+        for i in fd_ids:
+            self.fds[i] = -np.log(ys[i] / ys[i-1]) / (xs[i] - xs[i-1])
+        for i in f_ids:
+            self.fs[i] = (xs[i] - xs[i-1]) / (xs[i+1] - xs[i-1]) * self.fds[i+1] + \
+                (xs[i+1] - xs[i]) / (xs[i+1] - xs[i-1]) * self.fds[i]
+        if n == 2:
+            self.fs[1] = 0
         self.fs[0] = self.fds[1] - (self.fs[1] - self.fds[1]) / 2
         self.fs[n-1] = self.fds[n-1] - (self.fs[n-2] - self.fds[n-1]) / 2
 
     def get_value(self, x: float):
         super()._get_value(x)
         if x > self._xs[-1]:
-            f_x = -np.log(self._ys[-1] / self.get_value(self._xs[-1]-self._eps))
-            return self._ys[-1] * np.exp(-f_x * (x-self._xs[-1]))
+            return self._get_extrapolated_value(x)
+        return self._get_interpolated_value(x)
+
+    def _get_extrapolated_value(self, x: float) -> float:
+        f_x = -np.log(self._ys[-1] / self._get_interpolated_value(self._xs[-1]-self._eps))
+        return self._ys[-1] * np.exp(-f_x * (x-self._xs[-1]))
+
+    def _get_interpolated_value(self, x: float) -> float:
         ih = bisect.bisect_left(self._xs, x)
         if x == self._xs[ih]:
             return self._ys[ih]
@@ -186,3 +265,169 @@ class MonotoneConvex(Interpolator):
                 gx_s += (gi-anu) * dxr * dxr * (dx-nu) / 3
         return self._ys[ih-1] * np.exp(-(self.fds[ih] * (x-self._xs[ih-1]) + gx_s * (self._xs[ih]-self._xs[ih-1])))
 
+    def get_values(self, xs: np.ndarray) -> np.ndarray:
+        xs = np.asarray(xs, dtype=float)
+        knot_xs, knot_ys = np.array(self._xs, dtype=float), np.array(self._ys, dtype=float)
+        fds, fs = np.array(self.fds, dtype=float), np.array(self.fs, dtype=float)
+        if len(xs) and xs.min() < knot_xs[0]:
+            raise IndexError("Out of node bounds for monotone convex")
+        extrapolate = xs > knot_xs[-1]
+        ih = np.clip(np.searchsorted(knot_xs, xs, side='left'), 1, len(knot_xs)-1)
+        on_knot = knot_xs[ih] == xs
+        dx = (xs-knot_xs[ih-1]) / (knot_xs[ih]-knot_xs[ih-1])
+        gi = fs[ih] - fds[ih]
+        gi_1 = fs[ih-1] - fds[ih]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # same regions of forward shape as get_value
+            region_1 = ((gi_1 > 0) & (-gi_1/2 >= gi) & (gi >= -2*gi_1)) | ((gi_1 < 0) & (-gi_1/2 <= gi) & (gi <= -2*gi_1))
+            region_2 = ((gi_1 < 0) & (gi > -2*gi_1)) | ((gi_1 > 0) & (gi < -2*gi_1))
+            region_3 = ((gi_1 > 0) & (0 > gi) & (gi > -gi_1/2)) | ((gi_1 < 0) & (0 < gi) & (gi < -gi_1/2))
+            gx_s_1 = (gi_1 * (1 - 2*dx + dx*dx) + gi * (-dx + dx*dx)) * dx
+            nu_2 = (gi + 2*gi_1) / (gi - gi_1)
+            dxr_2 = (dx-nu_2) / (1-nu_2)
+            gx_s_2 = gi_1 * dx + np.where(dx > nu_2, (gi-gi_1) * dxr_2 * dxr_2 * (dx-nu_2) / 3, 0)
+            nu_3 = 3*gi / (gi - gi_1)
+            dxr_3 = dx / nu_3
+            gx_s_3 = gi * dx + np.where(dx < nu_3, (gi_1-gi) * (1 - dxr_3 + dxr_3 * dxr_3 / 3) * dx, (gi_1-gi) * nu_3 / 3)
+            nu_4 = gi / (gi + gi_1)
+            anu = -gi_1*gi / (gi_1 + gi)
+            dxr_4 = dx / nu_4
+            dxr_4_h = (dx-nu_4) / (1-nu_4)
+            gx_s_4 = anu * dx + np.where(
+                dx < nu_4,
+                (gi_1-anu) * (1 - dxr_4 + dxr_4 * dxr_4 / 3) * dx,
+                (gi_1-anu) * nu_4 / 3 + (gi-anu) * dxr_4_h * dxr_4_h * (dx-nu_4) / 3)
+            gx_s = np.select([region_1, region_2, region_3], [gx_s_1, gx_s_2, gx_s_3], default=gx_s_4)
+        values = knot_ys[ih-1] * np.exp(-(fds[ih] * (xs-knot_xs[ih-1]) + gx_s * (knot_xs[ih]-knot_xs[ih-1])))
+        values = np.where(on_knot, knot_ys[ih], values)
+        if extrapolate.any():
+            values[extrapolate] = [self._get_extrapolated_value(x) for x in xs[extrapolate]]
+        return values
+
+
+@dataclass
+class LogAkima(Interpolator):
+    """Cubic Hermite in log value with Akima slopes, a knot moves values only up to 3 knots either side"""
+
+    def __post_init__(self, xy_init):
+        super().__post_init__(xy_init)
+        self._set_slopes()
+
+    def update(self, xy_init):
+        xs_prev, ys_prev = list(self._xs), list(self._ys)
+        super().__post_init__(xy_init)
+        n = len(self._ys)
+        if len(xs_prev) != n or any(x_prev != x for x_prev, x in zip(xs_prev, self._xs)):
+            return self._set_slopes()
+        knot_ids = [i for i in range(n) if ys_prev[i] != self._ys[i]]
+        # secants are extrapolated at both ends so knots near them change all end slopes
+        if any(k < 3 or k > n-4 for k in knot_ids):
+            return self._set_slopes()
+        self._log_ys[knot_ids] = np.log(np.array(self._ys, dtype=float)[knot_ids])
+        for k in knot_ids:
+            for j in (k-1, k):
+                self._secants[j+2] = (self._log_ys[j+1] - self._log_ys[j]) / (self._xs[j+1] - self._xs[j])
+        for i in sorted({i for k in knot_ids for i in range(k-2, k+3)}):
+            self._slopes[i] = self._get_slope(i)
+
+    def _set_slopes(self) -> None:
+        xs = np.array(self._xs, dtype=float)
+        self._log_ys = np.log(np.array(self._ys, dtype=float))
+        n = len(xs)
+        # secant j between knots j and j+1 at index j+2, with 2 extrapolated either side
+        self._secants = np.zeros(n+3)
+        if n > 1:
+            self._secants[2:n+1] = np.diff(self._log_ys) / np.diff(xs)
+        if n > 2:
+            self._secants[1] = 2*self._secants[2] - self._secants[3]
+            self._secants[0] = 2*self._secants[1] - self._secants[2]
+            self._secants[n+1] = 2*self._secants[n] - self._secants[n-1]
+            self._secants[n+2] = 2*self._secants[n+1] - self._secants[n]
+        else:
+            self._secants[:] = self._secants[2]
+        self._slopes = np.array([self._get_slope(i) for i in range(n)])
+
+    def _get_slope(self, i: int) -> float:
+        m = self._secants
+        w_1, w_2 = abs(m[i+3] - m[i+2]), abs(m[i+1] - m[i])
+        if w_1 + w_2 == 0:
+            return (m[i+1] + m[i+2]) / 2
+        return (w_1 * m[i+1] + w_2 * m[i+2]) / (w_1 + w_2)
+
+    def get_value(self, x: float) -> float:
+        super()._get_value(x)
+        return np.exp(self._get_log_values(np.array([x], dtype=float))[0])
+
+    def get_values(self, xs: np.ndarray) -> np.ndarray:
+        return np.exp(self._get_log_values(np.asarray(xs, dtype=float)))
+
+    def _get_log_values(self, xs: np.ndarray) -> np.ndarray:
+        knot_xs, log_ys, slopes = np.array(self._xs, dtype=float), self._log_ys, self._slopes
+        if len(knot_xs) == 1:
+            return np.full(len(xs), log_ys[0])
+        ih = np.clip(np.searchsorted(knot_xs, xs, side='right'), 1, len(knot_xs)-1)
+        h = knot_xs[ih] - knot_xs[ih-1]
+        t = (xs - knot_xs[ih-1]) / h
+        log_values = (2*t**3 - 3*t**2 + 1) * log_ys[ih-1] + (t**3 - 2*t**2 + t) * h * slopes[ih-1] + \
+            (-2*t**3 + 3*t**2) * log_ys[ih] + (t**3 - t**2) * h * slopes[ih]
+        # flat forward beyond the last knot
+        beyond = xs > knot_xs[-1]
+        log_values[beyond] = log_ys[-1] + slopes[-1] * (xs[beyond] - knot_xs[-1])
+        return log_values
+
+
+# log of value is linear between knots
+LOG_LINEAR_TYPES = (fromString_super(type='LogLinear'), FlatRate)
+# number of neighbouring knots on either side that an interpolated value depends on
+LOCAL_SUPPORT_WIDTHS = {
+    fromString_super(type='LogLinear'): 1,
+    FlatRate: 1,
+    FlatRateBD: 1,
+    MonotoneConvex: 2,
+    LogAkima: 3,
+}
+
+def get_support_width(interpolator_class: type[Interpolator]) -> int | None:
+    """Knots either side affected by a knot update, None for global interpolators like splines"""
+    return LOCAL_SUPPORT_WIDTHS.get(interpolator_class)
+
+def get_values(interpolator: Interpolator, xs: np.ndarray) -> np.ndarray:
+    """Interpolated values at an array of xs"""
+    xs = np.asarray(xs, dtype=float)
+    if hasattr(interpolator, 'get_values'):
+        return interpolator.get_values(xs)
+    if len(xs) == 0:
+        return np.zeros(0)
+    if isinstance(interpolator, LOG_LINEAR_TYPES) and len(interpolator._xs) > 1 and \
+            interpolator._xs[0] <= xs.min() and xs.max() <= interpolator._xs[-1]:
+        return np.exp(np.interp(xs, interpolator._xs, np.log(interpolator._ys)))
+    return np.array([interpolator.get_value(x) for x in xs])
+
+def get_log_weights(interpolator: Interpolator, xs: list[float], eps: float = 1e-6) -> np.ndarray:
+    """Sensitivities of log interpolated values at xs to log knot values"""
+    knot_xs = np.array(interpolator._xs, dtype=float)
+    xs = np.array(xs, dtype=float)
+    weights = np.zeros((len(xs), len(knot_xs)))
+    if len(xs) == 0:
+        return weights
+    if isinstance(interpolator, LOG_LINEAR_TYPES) and len(knot_xs) > 1 and \
+            knot_xs[0] <= xs.min() and xs.max() <= knot_xs[-1]:
+        ih = np.clip(np.searchsorted(knot_xs, xs, side='left'), 1, len(knot_xs)-1)
+        weight_h = (xs - knot_xs[ih-1]) / (knot_xs[ih] - knot_xs[ih-1])
+        rows = np.arange(len(xs))
+        weights[rows, ih] = weight_h
+        weights[rows, ih-1] = 1 - weight_h
+        return weights
+    # bump each knot for interpolators without local weights
+    knots = list(zip(interpolator._xs, interpolator._ys))
+    log_values = np.log([interpolator.get_value(x) for x in xs])
+    try:
+        for ki, (knot_x, knot_y) in enumerate(knots):
+            knots_up = knots.copy()
+            knots_up[ki] = (knot_x, knot_y * np.exp(eps))
+            interpolator.update(knots_up)
+            weights[:, ki] = (np.log([interpolator.get_value(x) for x in xs]) - log_values) / eps
+    finally:
+        interpolator.update(knots)
+    return weights
+
@@ -5,15 +5,22 @@ from instruments.rate_curve import RateCurve
 from instruments.fixing import RateFixing
 from models.data_context import DataContext
 
+def get_fixed_amount(from_date: dtm.date, to_date: dtm.date, curve: RateCurve, fixing: RateFixing = None) -> float:
+    context = DataContext()
+    amount = context.get_fixing_index(fixing, curve._calendar, curve._daycount_type).get_compounded_amount(
+        from_date, to_date)
+    if amount is not None:
+        return amount
+    bdates = get_bdate_series(from_date, to_date, curve._calendar)
+    amount = 1
+    for i in range(len(bdates)-1):
+        amount *= (1 + context.get_fixing(fixing, bdates[i]) * curve.get_dcf_from(bdates[i], bdates[i+1]))
+    return amount
+
 def get_forecast_rate(from_date: dtm.date, to_date: dtm.date, curve: RateCurve, fixing: RateFixing = None) -> float:
     assert from_date <= to_date, f"Invalid period to calculate forecast rate {from_date}-{to_date}"
-    context = DataContext()
     if from_date < curve.date:
-        bdates = get_bdate_series(from_date, min(to_date, curve.date), curve._calendar)
-        amount = 1
-        for i in range(len(bdates)-1):
-            amount *= (1 + context.get_fixing(fixing, bdates[i]) * curve.get_dcf_from(bdates[i], bdates[i+1]))
-        
+        amount = get_fixed_amount(from_date, min(to_date, curve.date), curve, fixing)
         if to_date <= curve.date:
             return (amount - 1) / curve.get_dcf_from(from_date, curve.date)
         else:
@@ -21,3 +28,14 @@ def get_forecast_rate(from_date: dtm.date, to_date: dtm.date, curve: RateCurve,
             return (amount - 1) / curve.get_dcf_from(from_date, to_date)
     else:
         return curve.get_forward_rate(from_date, to_date)
+
+def get_forecast_rate_sensitivities(from_date: dtm.date, to_date: dtm.date, curve: RateCurve,
+                                    fixing: RateFixing = None) -> list[tuple[dtm.date, float]]:
+    if to_date <= curve.date:
+        return []
+    period_dcf = curve.get_dcf_from(from_date, to_date)
+    if from_date < curve.date:
+        amount = get_fixed_amount(from_date, curve.date, curve, fixing) / curve.get_df(to_date)
+        return [(to_date, -amount / period_dcf)]
+    df_ratio = curve.get_df(from_date) / curve.get_df(to_date)
+    return [(from_date, df_ratio / period_dcf), (to_date, -df_ratio / period_dcf)]
@@ -1,4 +1,7 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import math
 
 from markets import usd_lib, usd_rates, usd_rates_vol, usd_bonds, usd_bond_futs, usd_bonds_vol
 from markets import cny_rates, cny_fx_vol
@@ -11,13 +14,34 @@ logger = logging.Logger('')
 logger.setLevel(logging.DEBUG)
 
 
-def evaluate_rates_curves(start_date = None, end_date = None, ccys: list[str] = None) -> list[list[RateCurveGroupModel]]:
+def _init_rates_worker():
+    usd_rates.init()
+
+def _build_rates_curves(date, warm_start: bool = False) -> list[RateCurveGroupModel]:
+    ycg_usd_dt = usd_rates.construct(date)
+    for ycg_usd_dt_i in ycg_usd_dt:
+        ycg_usd_dt_i.build(calibrate_convexity=True, warm_start=warm_start)
+    return ycg_usd_dt
+
+def evaluate_rates_curves(start_date = None, end_date = None, ccys: list[str] = None,
+                          warm_start: bool = False, workers: int = None) -> list[list[RateCurveGroupModel]]:
     ycg_usd = []
-    for date in usd_lib.get_trade_dates(start_date, end_date):
-        ycg_usd_dt = usd_rates.construct(date)
-        for ycg_usd_dt_i in ycg_usd_dt:
-            ycg_usd_dt_i.build(calibrate_convexity=True)
-        ycg_usd.extend(ycg_usd_dt)
+    dates = usd_lib.get_trade_dates(start_date, end_date)
+    if workers and workers > 1 and len(dates) > 1:
+        # contiguous chunks of dates per worker so warm start can use the previous date
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_rates_worker) as executor:
+            for ycg_usd_dt in executor.map(partial(_build_rates_curves, warm_start=warm_start), dates,
+                                           chunksize=math.ceil(len(dates) / workers)):
+                # built groups come back whole, spread curves still share their base within a date
+                for ycg_usd_dt_i in ycg_usd_dt:
+                    ycg_usd_dt_i.update_context()
+                ycg_usd.extend(ycg_usd_dt)
+    else:
+        for date in dates:
+            ycg_usd_dt = usd_rates.construct(date)
+            for ycg_usd_dt_i in ycg_usd_dt:
+                ycg_usd_dt_i.build(calibrate_convexity=True, warm_start=warm_start)
+            ycg_usd.extend(ycg_usd_dt)
     res = [ycg_usd]
 
     if ccys and 'CNY' in ccys:
@@ -8,6 +8,7 @@ from instruments.swaps.template import SwapTemplate
 from instruments.vol_curve import VolCurve
 from markets import usd_lib
 from models.rate_curve_builder import RateCurveModel, RateCurveGroupModel
+from models.rate_curve_types import RateCurveBuildMethod
 from models.config_context import ConfigContext
 from models.data_context import DataContext
 
@@ -17,6 +18,7 @@ CONFIG_CONTEXT: ConfigContext = None
 RATE_VOL = 1.4/100
 NUM_STEPS = 7
 MIN_NODE_SPACE = 7
+BUILD_METHOD = RateCurveBuildMethod.Bootstrap
 
 
 def get_futures_for_curve(value_date: dtm.date, fixing_code: str) -> list[CurveInstrument]:
@@ -89,13 +91,19 @@ def _init():
         DATA_CONTEXT.add_fixing_series(code, db_reader.read_fixings(code, from_date=first_date))
 
 
-def construct(value_date: dtm.date = None):
+def init() -> None:
+    if CONFIG_CONTEXT:
+        return
+    _init()
     last_close_date = usd_lib.get_last_trade_date()
-    if not CONFIG_CONTEXT:
-        _init()
-        last_fixing_date = DATA_CONTEXT.get_fixing_series('SOFR').data.get_last_point()[0]
-        if last_close_date > last_fixing_date:
-            logger.warning(f"{last_close_date} is after the last available fixing {last_fixing_date}")
+    last_fixing_date = DATA_CONTEXT.get_fixing_series('SOFR').data.get_last_point()[0]
+    if last_close_date > last_fixing_date:
+        logger.warning(f"{last_close_date} is after the last available fixing {last_fixing_date}")
+
+
+def construct(value_date: dtm.date = None, build_method: RateCurveBuildMethod = BUILD_METHOD):
+    last_close_date = usd_lib.get_last_trade_date()
+    init()
     if not value_date:
         value_date = last_close_date
     is_live = value_date > last_close_date
@@ -152,7 +160,9 @@ def construct(value_date: dtm.date = None):
                     _collateral_curve_id='USD-SOFR', _spread_from='USD-SOFR', name=fixing_name)]
     
     return [
-        RateCurveGroupModel(value_date, curve_defs, _calendar=usd_lib.CALENDAR, name='USD'),
-        RateCurveGroupModel(value_date, ff_curve_defs, _calendar=usd_lib.CALENDAR, name='USD'),
+        RateCurveGroupModel(value_date, curve_defs, _calendar=usd_lib.CALENDAR, name='USD',
+                            _build_method=build_method),
+        RateCurveGroupModel(value_date, ff_curve_defs, _calendar=usd_lib.CALENDAR, name='USD',
+                            _build_method=build_method),
     ]
 
@@ -28,7 +28,7 @@ class BondCurveModel(NameDateClass):
     
     def get_graph_info(self):
         bond_measures = []
-        curve = CurveContext().get_rate_curve(self._base_curve, self.date)
+        curve = CurveContext().get_frozen_rate_curve(self._base_curve, self.date)
         yield_method = BondYieldParameters()
         for bnd, _ in self._bonds:
             date = bnd.maturity_date
@@ -120,7 +120,7 @@ class BondCurveModelNP(BondCurveModel):
         curve = self.spread_curve
         curve.update_nodes(log_values=values)
         error_primes = np.zeros(len(values), dtype=float)
-        nodes = [RateCurveNode(self.date, 1)] + curve.nodes
+        nodes = [RateCurveNode(self.date, 1)] + list(curve.nodes)
         for bond, wi in self.bonds_weight:
             price_error = wi * (bond.get_price_from_curve(self.date, curve) - bond.price(self.date))
             price_prime = np.zeros(len(values), dtype=float)
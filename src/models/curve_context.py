@@ -1,10 +1,14 @@
 import datetime as dtm
+import bisect
 
-from instruments.rate_curve import RateCurve
+from instruments.rate_curve import RateCurve, FrozenRateCurve
 
 class CurveContext(object):
     _rate_curves: dict[tuple[str, dtm.date], RateCurve] = {}
     _bond_curves: dict[tuple[str, dtm.date], RateCurve] = {}
+    _frozen_rate_curves: dict[tuple[str, dtm.date], FrozenRateCurve] = {}
+    # sorted dates of rate curves by name, for nearest date lookups
+    _rate_curve_dates: dict[str, list[dtm.date]] = {}
 
     def __new__(cls):
         if not hasattr(cls, 'instance'):
@@ -12,18 +16,30 @@ class CurveContext(object):
         return cls.instance
     
     def update_rate_curve(self, curve: RateCurve) -> None:
+        if (curve.name, curve.date) not in self._rate_curves:
+            bisect.insort(self._rate_curve_dates.setdefault(curve.name, []), curve.date)
         self._rate_curves[(curve.name, curve.date)] = curve
+        self._frozen_rate_curves.pop((curve.name, curve.date), None)
     
     def get_rate_curve(self, name: str, date: dtm.date):
         return self._rate_curves[(name, date)]
+    
+    def get_frozen_rate_curve(self, name: str, date: dtm.date) -> FrozenRateCurve:
+        """Frozen once per built curve, a new one when the curve is replaced"""
+        key = (name, date)
+        if key not in self._frozen_rate_curves:
+            self._frozen_rate_curves[key] = self._rate_curves[key].freeze()
+        return self._frozen_rate_curves[key]
 
     def get_rate_curve_last(self, name: str, date: dtm.date):
-        last_date = None
-        for n, d in self._rate_curves:
-            if n == name and d <= date:
-                if not last_date or last_date < d:
-                    last_date = d
-        return self._rate_curves[(name, last_date)]
+        dates = self._rate_curve_dates.get(name, [])
+        di = bisect.bisect_right(dates, date)
+        return self._rate_curves[(name, dates[di-1] if di else None)]
+    
+    def get_rate_curve_prior(self, name: str, date: dtm.date) -> RateCurve | None:
+        dates = self._rate_curve_dates.get(name, [])
+        di = bisect.bisect_left(dates, date)
+        return self._rate_curves[(name, dates[di-1])] if di else None
     
     def update_bond_curve(self, curve: RateCurve) -> None:
         self._bond_curves[(curve.name, curve.date)] = curve
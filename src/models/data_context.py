@@ -1,9 +1,12 @@
 import datetime as dtm
 
-from instruments.fixing import RateFixing, InflationIndex
+from common.chrono.calendar import CalendarID
+from common.chrono.daycount import DayCount
+from instruments.fixing import RateFixing, RateFixingIndex, InflationIndex
 
 class DataContext(object):
     _fixings: dict[str, RateFixing] = {}
+    _fixing_indices: dict[tuple[str, CalendarID, DayCount], RateFixingIndex] = {}
     _inflation_index: dict[str, InflationIndex] = {}
     
     def __new__(cls):
@@ -13,6 +16,8 @@ class DataContext(object):
     
     def add_fixing_series(self, code: str, fixing: RateFixing) -> None:
         self._fixings[code] = fixing
+        for key in [k for k in self._fixing_indices if k[0] == code]:
+            del self._fixing_indices[key]
     
     def get_fixing_series(self, code: str):
         return self._fixings[code]
@@ -20,6 +25,13 @@ class DataContext(object):
     def get_fixing(self, fix: RateFixing, date: dtm.date) -> float:
         return self._fixings[fix.name].get(date)
     
+    def get_fixing_index(self, fix: RateFixing, calendar: CalendarID,
+                         daycount_type: DayCount = DayCount.ACT360) -> RateFixingIndex:
+        key = (fix.name, calendar, daycount_type)
+        if key not in self._fixing_indices:
+            self._fixing_indices[key] = RateFixingIndex(self._fixings[fix.name], calendar, daycount_type)
+        return self._fixing_indices[key]
+    
     def add_inflation_series(self, code: str, index: InflationIndex) -> None:
         self._inflation_index[code] = index
     
@@ -2,9 +2,10 @@ from pydantic.dataclasses import dataclass
 from dataclasses import field
 import datetime as dtm
 import logging
-from copy import deepcopy
+import time
 import numpy as np
 import pandas as pd
+from scipy import sparse, optimize
 
 from common.base_class import NameClass, NameDateClass
 from common.date_helper import get_bdate_series, CalendarID
@@ -15,12 +16,16 @@ from instruments.fx.swap import FXSpot, FXCurve
 from instruments.rate_curve import RateCurve, SpreadCurve
 from instruments.vol_curve import VolCurve
 from models.curve_context import CurveContext
+from models.rate_curve_types import RateCurveBuildMethod
+from models.rate_curve_stats import RateCurveStatsRecorder
 
 CURVE_SOLVER_MAX_ITERATIONS = 10
 CURVE_SOLVER_TOLERANCE = 1e-6
 DF_UPPER_LIMIT = 1e1
 DF_LOWER_LIMIT = 1e-4
 EPSILON = 1e-4
+# root bracket around warm start seed, as rate move over the node period
+SEED_RATE_WIDTH = 2e-2
 
 logger = logging.Logger(__name__)
 
@@ -40,6 +45,7 @@ class RateCurveModel(NameClass):
     _constructor: NameDateClass = field(init=False)
     _nodes: list[dtm.date] = field(init=False)
     _nodes_instruments: dict[dtm.date, list[CurveInstrument]] = field(init=False)
+    _node_seeds: dict[dtm.date, float] = field(init=False, default_factory=dict)
     _collateral_curve: RateCurve = field(init=False, default=None)
 
     def __post_init__(self):
@@ -49,6 +55,7 @@ class RateCurveModel(NameClass):
                 nodes_instruments.setdefault(ins.node, []).append(ins)
         self._nodes = sorted(nodes_instruments.keys())
         self._nodes_instruments = nodes_instruments
+        self._node_ids = {nd: ni for ni, nd in enumerate(self._nodes)}
     
     @property
     def date(self) -> dtm.date:
@@ -80,9 +87,12 @@ class RateCurveModel(NameClass):
             kwargs['_domestic_curve'] = self._collateral_curve
         else:
             curve_obj = RateCurve
+        self._node_seeds = {}
+        if self._constructor.warm_start:
+            self._node_seeds = self.get_node_seeds(date)
         self.curve = curve_obj(
             date,
-            [(k, 1) for k in self._nodes],
+            [(k, self._node_seeds.get(k, 1)) for k in self._nodes],
             _calendar = self._constructor._calendar,
             name=f"{self._constructor.name}-{self.name}",
             **kwargs
@@ -91,6 +101,26 @@ class RateCurveModel(NameClass):
         if self._rate_vol_curve:
             self.set_convexity()
     
+    def get_node_seeds(self, date: dtm.date) -> dict[dtm.date, float]:
+        """Node values implied by the nearest prior curve, forward discount factors from date"""
+        seed_curve = CurveContext().get_rate_curve_prior(f"{self._constructor.name}-{self.name}", date)
+        if not seed_curve:
+            return {}
+        last_date = seed_curve.nodes[-1].date
+        if last_date <= date:
+            # no forward period left on the prior curve to seed from
+            return {}
+        date_df = seed_curve.get_interpolated_df(date)
+        last_df = seed_curve.get_interpolated_df(last_date) / date_df
+        seeds = {}
+        for k in self._nodes:
+            if k <= last_date:
+                seeds[k] = seed_curve.get_interpolated_df(k) / date_df
+            else:
+                # flat zero rate beyond the last seed node
+                seeds[k] = last_df ** ((k - date).days / (last_date - date).days)
+        return seeds
+    
     def get_calibration_summary(self):
         return pd.DataFrame(
             [(self.date, self.name, ins.name, ins.end, ins.underlier.data[self.date], ins.node,
@@ -114,6 +144,26 @@ class RateCurveModel(NameClass):
     def get_instrument_pv(self, instrument: CurveInstrument) -> float:
         return instrument.get_pv(self.curve, self._collateral_curve, self._collateral_spot)
     
+    def get_instrument_pv_sensitivities(self, instrument: CurveInstrument) -> list[tuple[RateCurve, dtm.date, float]]:
+        return instrument.get_pv_sensitivities(self.curve, self._collateral_curve, self._collateral_spot)
+    
+    def get_pv_curves(self) -> list[RateCurve]:
+        """Curves the instrument PVs can depend on"""
+        curves = []
+        for crv in (self.curve, self._collateral_curve):
+            while crv is not None:
+                curves.append(crv)
+                crv = crv._base_curve if isinstance(crv, SpreadCurve) else None
+        return curves
+    
+    def get_instrument_last_date(self, instrument: CurveInstrument) -> dtm.date:
+        if self._collateral_spot:
+            return max(instrument.last_date, self._collateral_spot.settle_date)
+        return instrument.last_date
+    
+    def get_node_last_date(self, date: dtm.date) -> dtm.date:
+        return max(self.get_instrument_last_date(inst) for inst in self._nodes_instruments[date])
+    
     def get_bootstrap_node_error(self, value: float, date: dtm.date) -> float:
         self.curve.update_node(date, value)
         node_insts = self._nodes_instruments[date]
@@ -158,6 +208,20 @@ class RateCurveModel(NameClass):
                 args=(date,), init_guess=0.0, tol=100,
                 jacobian=self.get_jacobian_node)
         else:
+            if date in self._node_seeds:
+                seed = self._node_seeds[date]
+                seed_width = np.exp(SEED_RATE_WIDTH * self.curve.get_dcf(date))
+                seed_bracket = [seed / seed_width, seed * seed_width]
+                # checked here rather than relying on the solver to raise when the root is outside
+                if self.get_bootstrap_node_error(seed_bracket[0], date) * \
+                        self.get_bootstrap_node_error(seed_bracket[1], date) <= 0:
+                    solver.find_root(
+                        self.get_bootstrap_node_error,
+                        args=(date,),
+                        bracket=seed_bracket
+                    )
+                    return True
+                logger.info(f"Root not bracketed around seed for node {date}")
             solver.find_root(
                 self.get_bootstrap_node_error,
                 args=(date,),
@@ -165,37 +229,58 @@ class RateCurveModel(NameClass):
             )
         return True
     
-    def set_convexity(self) -> None:
-        for f_ins in self._instruments:
-            f_ins.set_convexity(self._rate_vol_curve)
-        return
+    def set_convexity(self) -> dtm.date | None:
+        """Sets futures convexity and returns the earliest rate start of those changed"""
+        changed_dates = [dt for f_ins in self._instruments if (dt := f_ins.set_convexity(self._rate_vol_curve))]
+        return min(changed_dates, default=None)
     
-    def calibrate_convexity(self, node_vol_date: dtm.date = None) -> None:
-        self._constructor.build_simple()
+    def calibrate_convexity(self, node_vol_date: dtm.date = None) -> int:
+        """Calibrates vol nodes to convexity swaps on the built curve group, returns the number of re-solves"""
+        if not self._rate_vol_curve:
+            return 0
         if node_vol_date is None:
             node_vol_date = self.date
+        iterations = 0
         for inst in self._instruments:
-            if inst.is_convexity_swap(node_vol_date):
-                node_vol = self._rate_vol_curve.get_node(node_vol_date)
+            if not inst.is_convexity_swap(node_vol_date):
+                continue
+            node_vol = self._rate_vol_curve.get_node(node_vol_date)
+            for _ in range(CURVE_SOLVER_MAX_ITERATIONS):
                 vol_adjusted = inst.get_convexity_adjustment(
                     self.curve, node_vol_date, node_vol, self._collateral_curve)
-                if vol_adjusted is not None and node_vol != vol_adjusted:
-                    self._rate_vol_curve.update_node(node_vol_date, vol_adjusted)
-                    return self.calibrate_convexity(node_vol_date)
-                else:
-                    node_vol_date = inst.end
-                    self._rate_vol_curve.add_node(node_vol_date, node_vol)
-        return
+                if vol_adjusted is None or node_vol == vol_adjusted:
+                    break
+                node_vol = vol_adjusted
+                self._rate_vol_curve.update_node(node_vol_date, node_vol)
+                # only futures repriced by the vol move and nodes after them are re-solved
+                from_date = self.set_convexity()
+                if from_date:
+                    self._constructor.solve(from_date=from_date)
+                iterations += 1
+            else:
+                logger.error(f"Failed to calibrate convexity to {inst.name} after {CURVE_SOLVER_MAX_ITERATIONS}")
+            node_vol_date = inst.end
+            self._rate_vol_curve.add_node(node_vol_date, node_vol)
+        return iterations
 
 
 @dataclass
 class RateCurveGroupModel(NameDateClass):
     models: list[RateCurveModel]
     _calendar: CalendarID
+    _build_method: RateCurveBuildMethod = field(kw_only=True, default=RateCurveBuildMethod.Bootstrap)
+
+    solver_iterations: int = field(init=False, default=0)
+    convexity_iterations: int = field(init=False, default=0)
+    warm_start: bool = field(init=False, default=False)
 
     def __post_init__(self):
         for crv_model in self.models:
             crv_model._constructor = self
+        self._vol_nodes = []
+        self._vol_tied_nodes = []
+        self.jacobian = None
+        self.stats = None
     
     @property
     def curves(self) -> list[RateCurve]:
@@ -207,24 +292,40 @@ class RateCurveGroupModel(NameDateClass):
             node_dates = node_dates.union(crv_model._nodes)
         return sorted(list(node_dates))
     
-    def build_bootstrap(self, iter: int = 1) -> bool:
-        nodes_in = [deepcopy(crv_model.curve.nodes) for crv_model in self.models]
-        for k in self.get_bootstrap_nodes():
-            for crv_model in self.models:
-                if k not in crv_model._nodes:
-                    continue
-                crv_model.solve_node(k)
-        for i, crv_model in enumerate(self.models):
-            error = 0
-            for j, nd in enumerate(crv_model.curve.nodes):
-                assert nodes_in[i][j].date == nd.date, f"Unexpected nodes mismatch {nodes_in[i][j]} {nd}"
-                error += abs(nodes_in[i][j].value - nd.value)
-            if error > CURVE_SOLVER_TOLERANCE:
-                if iter >= CURVE_SOLVER_MAX_ITERATIONS:
-                    logger.error(f"Failed to fit the curve after {CURVE_SOLVER_MAX_ITERATIONS}.\n {nodes_in}")
-                    return False
-                return self.build_bootstrap(iter=iter+1)
-        return True
+    def build_bootstrap(self, from_date: dtm.date = None, full_sweep: bool = False) -> bool:
+        # nodes whose instruments see discount factors after dirty date are (re-)solved, every node on a full sweep
+        dirty_date = dtm.date.min if full_sweep else (from_date if from_date else self.date)
+        node_supports = [crv_model.curve.get_node_support() for crv_model in self.models]
+        for iter in range(1, CURVE_SOLVER_MAX_ITERATIONS+1):
+            nodes_in = [crv_model.curve.node_values for crv_model in self.models]
+            solved_last_date = self.date
+            next_dirty_date = dtm.date.max
+            for k in self.get_bootstrap_nodes():
+                for i, crv_model in enumerate(self.models):
+                    if k not in crv_model._node_ids:
+                        continue
+                    node_last_date = crv_model.get_node_last_date(k)
+                    if node_last_date <= dirty_date:
+                        # clean nodes already fit are disturbed by later moves all the same
+                        solved_last_date = max(solved_last_date, node_last_date)
+                        continue
+                    crv_model.solve_node(k)
+                    ni = crv_model._node_ids[k]
+                    # moving node disturbs instruments of nodes solved before it
+                    support_date = node_supports[i][ni]
+                    if abs(crv_model.curve._node_values[ni] - nodes_in[i][ni]) > CURVE_SOLVER_TOLERANCE and \
+                            (full_sweep or support_date < solved_last_date):
+                        next_dirty_date = min(next_dirty_date, support_date)
+                    solved_last_date = max(solved_last_date, node_last_date)
+            if next_dirty_date == dtm.date.max:
+                self.solver_iterations = iter
+                return True
+            dirty_date = dtm.date.min if full_sweep else next_dirty_date
+        logger.error(f"Failed to fit the curve after {CURVE_SOLVER_MAX_ITERATIONS}.\n {nodes_in}")
+        return False
+    
+    def get_node_log_values(self) -> np.ndarray:
+        return np.log(np.concatenate([crv_model.curve.node_values for crv_model in self.models]))
     
     def set_nodes(self, log_values: list[float]):
         node_lens_sum = [0]
@@ -234,77 +335,270 @@ class RateCurveGroupModel(NameDateClass):
         return
     
     def get_solver_error(self, log_values: list[float]) -> float:
-        errors = []
         self.set_nodes(log_values)
-        for crv_model in self.models:
-            for ins in crv_model.node_instruments():
-                errors.append(crv_model.get_instrument_pv(ins))
-        return np.sqrt(np.mean(np.array(errors)**2))
+        return np.sqrt(np.mean(self.get_node_pvs()**2))
     
-    def get_jacobian(self, log_values: list[float] = None) -> list[float]:
-        self.set_nodes(log_values)
-        node_count = len(log_values)
-        inst_count = sum([len(crv_model.node_instruments()) for crv_model in self.models])
-        pvs = np.zeros(inst_count)
-        pvs_up = np.zeros((node_count, inst_count))
-        kn, ki = 0, 0
+    def get_node_instruments(self) -> list[tuple[RateCurveModel, CurveInstrument]]:
+        return [(crv_model, inst) for crv_model in self.models for inst in crv_model.node_instruments()]
+    
+    def get_node_pvs(self) -> np.ndarray:
+        pvs = []
         for crv_model in self.models:
             for inst in crv_model.node_instruments():
-                pvs[ki] = crv_model.get_instrument_pv(inst)
+                pvs.append(crv_model.get_instrument_pv(inst))
+        return np.array(pvs)
+    
+    def get_jacobian_entries(self, instruments: list[tuple[RateCurveModel, CurveInstrument]] = None) -> sparse.coo_matrix:
+        """Analytic sensitivities of instrument PVs to log node values, node instruments by default,
+        filled only where a node supports the discount factors an instrument sees"""
+        if instruments is None:
+            instruments = self.get_node_instruments()
+        node_offsets = {}
+        node_count = 0
+        for crv_model in self.models:
+            node_offsets[id(crv_model.curve)] = node_count
+            node_count += len(crv_model._nodes)
+        # per curve sensitivities by date, chained through spread curves to their base
+        curve_dates = {}
+        for ki, (crv_model, inst) in enumerate(instruments):
+            for crv, dt, sens in crv_model.get_instrument_pv_sensitivities(inst):
+                while crv is not None:
+                    if id(crv) in node_offsets:
+                        curve_dates.setdefault(id(crv), (crv, {}))[1].setdefault(dt, []).append((ki, sens))
+                    crv = crv._base_curve if isinstance(crv, SpreadCurve) else None
+        rows, cols, values = [], [], []
+        for crv, date_sensitivities in curve_dates.values():
+            dates = list(date_sensitivities.keys())
+            weights = crv.get_node_weights(dates)
+            kn = node_offsets[id(crv)]
+            for di, dt in enumerate(dates):
+                node_ids = np.flatnonzero(weights[di])
+                for row, sens in date_sensitivities[dt]:
+                    rows.append(np.full(len(node_ids), row))
+                    cols.append(kn + node_ids)
+                    values.append(sens * weights[di, node_ids])
+        if not rows:
+            return sparse.coo_matrix((len(instruments), node_count))
+        # entries repeated across dates are summed on conversion
+        return sparse.coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                                 shape=(len(instruments), node_count))
+    
+    def get_jacobian_matrix(self, instruments: list[tuple[RateCurveModel, CurveInstrument]] = None) -> np.ndarray:
+        return self.get_jacobian_entries(instruments).toarray()
+    
+    def get_jacobian_sparsity(self) -> sparse.csc_matrix:
+        """Structurally non-zero entries of node instrument PVs by log node values"""
+        rows, cols = [], []
+        node_supports = [crv_model.curve.get_node_support() for crv_model in self.models]
+        ki = 0
+        for crv_model_i in self.models:
+            pv_curves = crv_model_i.get_pv_curves()
+            for inst in crv_model_i.node_instruments():
+                last_date = crv_model_i.get_instrument_last_date(inst)
+                kn = 0
+                for crv_model_j, node_support in zip(self.models, node_supports):
+                    if any(crv is crv_model_j.curve for crv in pv_curves):
+                        for kj, support_date in enumerate(node_support):
+                            if support_date < last_date:
+                                rows.append(ki)
+                                cols.append(kn + kj)
+                    kn += len(node_support)
                 ki += 1
-            
-            for node in crv_model._nodes:
-                df = crv_model.curve.get_df(node)
-                df_up = df * np.exp(EPSILON)
-                crv_model.curve.update_node(node, df_up)
-                
-                kj = 0
-                for crv_model_j in self.models:
-                    for inst in crv_model_j.node_instruments():
-                        # if node <= inst.node:
-                        pvs_up[kn][kj] = crv_model_j.get_instrument_pv(inst)
-                        kj += 1
-                # df_down = df * np.exp(-EPSILON)
-                # crv_model.curve.update_node(kn, df_down)
-                crv_model.curve.update_node(node, df)
+        return sparse.csc_matrix((np.ones(len(rows)), (rows, cols)), shape=(ki, kn))
+    
+    def get_jacobian_matrix_bump(self, sparsity: sparse.csc_matrix = None) -> sparse.csc_matrix:
+        """Sensitivities of node instrument PVs to log node values by bumping each node,
+        only entries in the sparsity pattern are repriced, all of them by default"""
+        node_instruments = self.get_node_instruments()
+        pvs = self.get_node_pvs()
+        if sparsity is None:
+            sparsity = sparse.csc_matrix(np.ones((len(pvs), sum(len(crv_model._nodes) for crv_model in self.models))))
+        values = np.zeros(sparsity.nnz)
+        kn = 0
+        for crv_model in self.models:
+            for node in list(crv_model.curve.nodes):
+                crv_model.curve.update_node(node.date, node.value * np.exp(EPSILON))
+                try:
+                    for kv in range(sparsity.indptr[kn], sparsity.indptr[kn+1]):
+                        ki = sparsity.indices[kv]
+                        crv_model_i, inst = node_instruments[ki]
+                        values[kv] = (crv_model_i.get_instrument_pv(inst) - pvs[ki]) / EPSILON
+                finally:
+                    crv_model.curve.update_node(node.date, node.value)
                 kn += 1
-
-        gradient = np.zeros(node_count)
-        for kn in range(node_count):
-            gradient[kn] = np.mean((pvs_up[kn] - pvs) * pvs) / EPSILON
-            # gradient[kn] = np.mean((pvs_up[kn] - pvs_down[kn]) * pvs) / (2*EPSILON)
-        gradient /= np.sqrt(np.mean(pvs*pvs))
-        return gradient
+        return sparse.csc_matrix((values, sparsity.indices, sparsity.indptr), shape=sparsity.shape)
+    
+    def get_jacobian(self, log_values: list[float] = None) -> list[float]:
+        self.set_nodes(log_values)
+        pvs = self.get_node_pvs()
+        jacobian = self.get_jacobian_entries()
+        return jacobian.T @ pvs / (len(pvs) * np.sqrt(np.mean(pvs*pvs)))
     
     def build_solver(self) -> bool:
-        node_count = sum([len(crv_model._nodes) for crv_model in self.models])
-        init_guess = np.zeros(node_count, dtype=float)
         res = solver.find_fit(cost_f=self.get_solver_error,
-                              init_guess=init_guess,
+                              init_guess=self.get_node_log_values(),
                               jacobian=self.get_jacobian)
         self.set_nodes(res)
         return True
     
+    def get_residuals(self, log_values: list[float]) -> np.ndarray:
+        self.set_nodes(log_values)
+        return self.get_node_pvs()
+    
+    def get_residuals_jacobian(self, log_values: list[float]) -> sparse.csr_matrix:
+        self.set_nodes(log_values)
+        return self.get_jacobian_entries().tocsr()
+    
+    def build_least_squares(self) -> bool:
+        # trust region reflective on the vector of instrument PVs solves its steps iteratively on the
+        # sparse Jacobian, MINPACK Levenberg-Marquardt factorizes it dense
+        res = optimize.least_squares(self.get_residuals, self.get_node_log_values(),
+                                     jac=self.get_residuals_jacobian, method='trf', tr_solver='lsmr',
+                                     xtol=CURVE_SOLVER_TOLERANCE)
+        self.set_nodes(res.x)
+        self.solver_iterations = res.njev
+        logger.info(f"{self.name} least squares fit in {res.njev} iterations, {res.nfev} evaluations")
+        if not res.success:
+            logger.error(f"Failed to fit the curve after {res.njev} iterations: {res.message}")
+            return False
+        return True
+    
+    def solve(self, from_date: dtm.date = None) -> bool:
+        match self._build_method:
+            case RateCurveBuildMethod.Solver:
+                return self.build_solver()
+            case RateCurveBuildMethod.LeastSquares:
+                return self.build_least_squares()
+        return self.build_bootstrap(from_date=from_date)
+    
+    def get_convexity_instruments(self) -> list[tuple[RateCurveModel, CurveInstrument]]:
+        return [(crv_model, inst) for crv_model in self.models if crv_model._rate_vol_curve
+                for inst in crv_model._instruments if inst.is_convexity_swap(self.date)]
+    
+    def set_joint_vol_nodes(self) -> None:
+        # vol node at curve date and at each convexity swap end, the last one follows the one before it
+        self._vol_nodes = []
+        self._vol_tied_nodes = []
+        for crv_model in self.models:
+            if not crv_model._rate_vol_curve:
+                continue
+            vol_curve = crv_model._rate_vol_curve
+            node_dates = [self.date] + [inst.end for inst in crv_model._instruments
+                                        if inst.is_convexity_swap(self.date)]
+            vol_node_dates = [nd.date for nd in vol_curve.nodes]
+            for dt in node_dates:
+                if dt not in vol_node_dates:
+                    vol_curve.add_node(dt, vol_curve.get_vol(dt))
+            self._vol_nodes.extend((crv_model, dt) for dt in node_dates[:-1])
+            if len(node_dates) > 1:
+                self._vol_tied_nodes.append((crv_model, node_dates[-1], node_dates[-2]))
+        return
+    
+    def get_joint_values(self) -> np.ndarray:
+        vols = [crv_model._rate_vol_curve.get_node(dt) for crv_model, dt in self._vol_nodes]
+        return np.concatenate((self.get_node_log_values(), vols))
+    
+    def set_joint_values(self, values: list[float]) -> None:
+        node_count = len(values) - len(self._vol_nodes)
+        self.set_nodes(values[:node_count])
+        for (crv_model, dt), vol in zip(self._vol_nodes, values[node_count:]):
+            crv_model._rate_vol_curve.update_node(dt, vol)
+        for crv_model, dt, dt_from in self._vol_tied_nodes:
+            crv_model._rate_vol_curve.update_node(dt, crv_model._rate_vol_curve.get_node(dt_from))
+        for crv_model in self.models:
+            if crv_model._rate_vol_curve:
+                crv_model.set_convexity()
+        return
+    
+    def get_joint_residuals(self, values: list[float]) -> np.ndarray:
+        self.set_joint_values(values)
+        convexity_pvs = [crv_model.get_instrument_pv(inst) for crv_model, inst in self.get_convexity_instruments()]
+        return np.concatenate((self.get_node_pvs(), convexity_pvs))
+    
+    def get_joint_jacobian(self, values: list[float]) -> np.ndarray:
+        """Analytic sensitivities to log node values, bumped sensitivities to vol nodes"""
+        values = np.array(values)
+        self.set_joint_values(values)
+        instruments = self.get_node_instruments() + self.get_convexity_instruments()
+        jacobian_nodes = self.get_jacobian_matrix(instruments)
+        # vol nodes only reprice futures through convexity, central differences on bumps relative to the vol
+        node_count = len(values) - len(self._vol_nodes)
+        jacobian_vols = np.zeros((len(instruments), len(self._vol_nodes)))
+        for vi in range(len(self._vol_nodes)):
+            bump = EPSILON * max(abs(values[node_count + vi]), EPSILON)
+            values_up, values_down = values.copy(), values.copy()
+            values_up[node_count + vi] += bump
+            values_down[node_count + vi] -= bump
+            jacobian_vols[:, vi] = (self.get_joint_residuals(values_up) - self.get_joint_residuals(values_down)) / (2 * bump)
+        self.set_joint_values(values)
+        return np.hstack((jacobian_nodes, jacobian_vols))
+    
+    def build_joint(self) -> bool:
+        """Solves curve nodes and rate vol nodes together on node and convexity swap PVs"""
+        start_time = time.perf_counter()
+        self.set_joint_vol_nodes()
+        self.build_simple()
+        res = optimize.least_squares(self.get_joint_residuals, self.get_joint_values(),
+                                     jac=self.get_joint_jacobian, method='lm',
+                                     xtol=CURVE_SOLVER_TOLERANCE)
+        self.set_joint_values(res.x)
+        self.jacobian = self.get_joint_jacobian(res.x)
+        self.solver_iterations = res.njev
+        logger.info(f"{self.name} joint curve and convexity fit in {res.njev} iterations, "\
+                    f"{res.nfev} evaluations, {time.perf_counter() - start_time:.3f}s")
+        if not res.success:
+            logger.error(f"Failed to fit the curve and convexity after {res.njev} iterations: {res.message}")
+            return False
+        return True
+    
     def build_simple(self) -> bool:
         for crv_model in self.models:
             crv_model.reset(self.date)
-        # return self.build_solver()
-        return self.build_bootstrap()
+        return self.solve()
     
-    def calibrate_convexity(self, node_vol_date: dtm.date = None) -> None:
+    def calibrate_convexity(self) -> bool:
+        start_time = time.perf_counter()
+        res = self.build_simple()
+        self.convexity_iterations = 0
         for con in self.models:
-            con.calibrate_convexity(node_vol_date=node_vol_date)
-        return
+            self.convexity_iterations += con.calibrate_convexity()
+        logger.info(f"{self.name} convexity calibrated with {self.convexity_iterations} re-solves "\
+                    f"in {time.perf_counter() - start_time:.3f}s")
+        return res
     
-    def build(self, calibrate_convexity: bool = False) -> bool:
+    def build(self, calibrate_convexity: bool = False, warm_start: bool = False,
+              joint_convexity: bool = False) -> bool:
+        # seed nodes from the nearest prior curve already built
+        self.warm_start = warm_start
         if calibrate_convexity:
+            if joint_convexity:
+                return self.build_joint()
             return self.calibrate_convexity()
         else:
             return self.build_simple()
     
+    def update_context(self) -> None:
+        """Registers curves of a group built in another process"""
+        for crv_model in self.models:
+            CurveContext().update_rate_curve(crv_model.curve)
+    
     def get_calibration_summary(self) -> list[pd.DataFrame]:
         return pd.concat([con.get_calibration_summary() for con in self.models])
     
+    def enable_stats(self) -> RateCurveStatsRecorder:
+        if not self.stats:
+            self.stats = RateCurveStatsRecorder()
+            self.stats.attach(self)
+        return self.stats
+    
+    def get_build_summary(self) -> pd.DataFrame:
+        assert self.stats, f"Build stats not enabled for {self.name}"
+        return self.stats.get_build_summary()
+    
+    def get_node_build_summary(self) -> pd.DataFrame:
+        assert self.stats, f"Build stats not enabled for {self.name}"
+        return self.stats.get_nodes_summary()
+    
     def get_nodes_summary(self):
         return pd.concat([con.get_nodes_summary() for con in self.models])
     
@@ -313,12 +607,10 @@ class RateCurveGroupModel(NameDateClass):
         node_zrates = {}
         for yc in self.curves:
             bdates = get_bdate_series(self.date, yc.nodes[-1].date, self._calendar)
-            fwd_rates_i = {}
             # node_zrates_i = {}
-            for id, dt in enumerate(bdates[:-1]):
-                fwd_rates_i[dt] = yc.get_forward_rate(dt, bdates[id+1])
+            fwd_rates_i = yc.get_forward_rates(bdates[:-1], bdates[1:])
             # for nd in yc._nodes:
             #     node_zrates_i[nd.date] = yc.get_spot_rate(nd.date)
-            fwd_rates[yc.display_name()] = pd.Series(fwd_rates_i)
+            fwd_rates[yc.display_name()] = pd.Series(fwd_rates_i, index=bdates[:-1])
             # node_zrates[yc.display_name()] = pd.Series(node_zrates_i)
         return fwd_rates, node_zrates
@@ -0,0 +1,148 @@
+from pydantic.dataclasses import dataclass
+import datetime as dtm
+import time
+import functools
+import pandas as pd
+
+
+@dataclass
+class RateCurveNodeStats:
+    curve: str
+    node: dtm.date
+    root_evals: int = 0
+    pv_calls: int = 0
+    df_evals: int = 0
+    wall_time: float = 0
+
+
+@dataclass
+class RateCurveBuildStats:
+    group: str
+    date: dtm.date
+    build_method: str
+    wall_time: float = 0
+    solver_iterations: int = 0
+    convexity_iterations: int = 0
+    convexity_depth: int = 0
+    pv_calls: int = 0
+    df_evals: int = 0
+
+
+class RateCurveStatsRecorder:
+    """Counters for curve group builds, methods are wrapped on the instances only once attached"""
+
+    def __init__(self):
+        self.builds: list[RateCurveBuildStats] = []
+        self.nodes: list[RateCurveNodeStats] = []
+        self._build = None
+        self._node = None
+        self._vol_updates = {}
+        self._df_depth = 0
+
+    def attach(self, group) -> None:
+        self._wrap(group, 'build', self._record_build)
+        for crv_model in group.models:
+            self._wrap(crv_model, 'solve_node', functools.partial(self._record_node, crv_model))
+            self._wrap(crv_model, 'get_bootstrap_node_error', self._record_root_eval)
+            self._wrap(crv_model, 'get_instrument_pv', self._record_pv)
+            self._wrap(crv_model, 'reset', functools.partial(self._record_reset, crv_model))
+            if hasattr(crv_model, 'curve'):
+                self._wrap_curve(crv_model.curve)
+            if crv_model._rate_vol_curve:
+                self._wrap(crv_model._rate_vol_curve, 'update_node', self._record_vol_update)
+
+    def _wrap_curve(self, curve) -> None:
+        self._wrap(curve, 'get_df', self._record_df)
+        self._wrap(curve, 'get_dfs', self._record_dfs)
+        self._wrap(curve, 'get_forward_rates', self._record_forward_rates)
+
+    @staticmethod
+    def _wrap(obj, name: str, wrapper) -> None:
+        func = getattr(obj, name)
+        # instance dict bypasses frozen and validated assignment
+        obj.__dict__[name] = functools.partial(wrapper, func)
+
+    def _record_build(self, func, *args, **kwargs):
+        group = func.__self__
+        self._build = RateCurveBuildStats(group.name, group.date, group._build_method)
+        self._vol_updates = {}
+        start_time = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._build.wall_time = time.perf_counter() - start_time
+            self._build.solver_iterations = group.solver_iterations
+            self._build.convexity_iterations = group.convexity_iterations
+            self._build.convexity_depth = max(self._vol_updates.values(), default=0)
+            self.builds.append(self._build)
+            self._build = None
+
+    def _record_node(self, crv_model, func, date: dtm.date):
+        node = RateCurveNodeStats(crv_model.curve.name, date)
+        self._node = node
+        start_time = time.perf_counter()
+        try:
+            return func(date)
+        finally:
+            node.wall_time = time.perf_counter() - start_time
+            self.nodes.append(node)
+            self._node = None
+
+    def _record_root_eval(self, func, *args, **kwargs):
+        if self._node:
+            self._node.root_evals += 1
+        return func(*args, **kwargs)
+
+    def _record_pv(self, func, *args, **kwargs):
+        if self._node:
+            self._node.pv_calls += 1
+        if self._build:
+            self._build.pv_calls += 1
+        return func(*args, **kwargs)
+
+    def _record_df_evals(self, count: int, func, *args, **kwargs):
+        # spread base curves and batch helpers nested in a recorded call are not counted again
+        if self._df_depth == 0:
+            if self._node:
+                self._node.df_evals += count
+            if self._build:
+                self._build.df_evals += count
+        self._df_depth += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._df_depth -= 1
+
+    def _record_df(self, func, *args, **kwargs):
+        return self._record_df_evals(1, func, *args, **kwargs)
+
+    def _record_dfs(self, func, dates, *args, **kwargs):
+        return self._record_df_evals(len(dates), func, dates, *args, **kwargs)
+
+    def _record_forward_rates(self, func, from_dates, to_dates, *args, **kwargs):
+        return self._record_df_evals(2 * len(from_dates), func, from_dates, to_dates, *args, **kwargs)
+
+    def _record_reset(self, crv_model, func, *args, **kwargs):
+        res = func(*args, **kwargs)
+        # curve is recreated on each reset
+        self._wrap_curve(crv_model.curve)
+        return res
+
+    def _record_vol_update(self, func, date: dtm.date, *args, **kwargs):
+        self._vol_updates[date] = self._vol_updates.get(date, 0) + 1
+        return func(date, *args, **kwargs)
+
+    def get_build_summary(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [(bs.date, bs.group, bs.build_method, bs.wall_time, bs.solver_iterations,
+              bs.convexity_iterations, bs.convexity_depth, bs.pv_calls, bs.df_evals) for bs in self.builds],
+            columns=['Date', 'Group', 'Method', 'Time', 'Iterations',
+                     'Convexity Iterations', 'Convexity Depth', 'PV Calls', 'DF Evals']
+        )
+
+    def get_nodes_summary(self) -> pd.DataFrame:
+        # a row for each node solve, repeated for bootstrap passes
+        return pd.DataFrame(
+            [(ns.curve, ns.node, ns.root_evals, ns.pv_calls, ns.df_evals, ns.wall_time) for ns in self.nodes],
+            columns=['Curve', 'Node', 'Root Evals', 'PV Calls', 'DF Calls', 'Time']
+        )
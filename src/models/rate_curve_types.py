@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+class RateCurveBuildMethod(StrEnum):
+    Bootstrap = 'Bootstrap'
+    Solver = 'Solver'
+    LeastSquares = 'LeastSquares'